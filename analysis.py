@@ -0,0 +1,265 @@
+"""
+키워드 분석 모음 (Streamlit 의존성 없음)
+한국어(Kiwi 명사)/영어(Arrow + 정규식) 키워드 빈도, 분석 결과 LRU 캐시, 워드 클라우드 PNG 렌더링을 담습니다.
+app.py의 visualize_data와 benchmarks/가 같은 함수를 그대로 import 해서 씁니다.
+"""
+import glob
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from kiwipiepy import Kiwi
+from wordcloud import WordCloud
+
+from instrumentation import metrics
+
+
+# --- 🧠 형태소 분석기 (프로세스 단위 공유) ---
+LANG_KR = "🇰🇷 한국어"
+LANG_EN = "🇺🇸 영어"
+KIWI_BATCH_SIZE = 2000
+
+# 불용어(Stopwords) 정의
+STOP_WORDS_KR = {
+    '게임', '진짜', '너무', '아니', '근데', '솔직히', '그냥', '이거', '정말', 
+    '생각', '사람', '하고', '해서', '있는', '없는', '입니다', '합니다', '그게', '존나', '때문에',
+    '스팀', '플레이', '정도', '하나', '지금', '일단', '뭔가', '보고', '하면', '해서', '하게', '같아요', '좋아요'
+}
+
+STOP_WORDS_EN = {
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'it', 'this', 'that',
+    'and', 'but', 'or', 'so', 'if', 'not', 'no', 'yes', 'can', 'will', 'my', 'your', 'he', 'she', 'they', 'we',
+    'game', 'games', 'play', 'playing', 'player', 'played', 'review', 'steam', 'fun', 'good', 'bad', 'best', 'like', 'just', 'more',
+    'time', 'story', 'really', 'very', 'much', 'get', 'even', 'make', 'made', 'about', 'from', 'out'
+}
+
+
+@lru_cache(maxsize=None)
+def get_kiwi():
+    """Kiwi는 프로세스당 한 번만 로드해 모든 세션이 공유합니다. (num_workers=-1: 가용 코어 전체)"""
+    with metrics.span('analysis.kiwi_load'):
+        kiwi = Kiwi(num_workers=-1)
+        kiwi.tokenize("")  # 지연 초기화를 미리 끝내 둠
+    return kiwi
+
+
+def extract_keywords(texts):
+    """전체 말뭉치의 한국어 명사 빈도(Counter) = 토큰화(tokenize_korean) + 집계(count_korean_nouns)"""
+    return count_korean_nouns(tokenize_korean(texts))
+
+
+def tokenize_korean(texts):
+    """
+    문서 단위 Kiwi 배치 토큰화: 문서마다 토큰 목록을 차례로 내보내는 제너레이터
+    배치 안의 문서들은 Kiwi 내부 스레드 풀에서 코어 수만큼 병렬로 분석됩니다.
+    """
+    kiwi = get_kiwi()
+    for i in range(0, len(texts), KIWI_BATCH_SIZE):
+        yield from kiwi.tokenize(texts[i:i + KIWI_BATCH_SIZE])
+
+
+def count_korean_nouns(token_lists):
+    count = Counter()
+    for tokens in token_lists:
+        count.update(_korean_nouns(tokens))
+    return count
+
+
+def _korean_nouns(tokens):
+    return (t.form for t in tokens if t.tag in ('NNG', 'NNP') and len(t.form) > 1 and t.form not in STOP_WORDS_KR)
+
+
+# Kiwi의 SL(외국어) 토큰과 같은 기준: 라틴 문자(ß, Latin Extended 포함) 연속 구간, 점으로 이은 구간(a.b, node.js)은 한 단어
+# Kiwi가 따로 태깅해 SL로 세지 않는 URL/메일 주소/@멘션/#해시태그는 먼저 지웁니다.
+# (문장 끝 마침표가 붙은 단어는 Kiwi가 'gr' + 'eat.'처럼 들쭉날쭉하게 쪼개므로, 여기서는 마침표를 떼고 'great'로 셉니다)
+_EN_LETTER = r"[a-z\u00c0-\u024f\u1e00-\u1eff]"
+EN_WORD_PATTERN = re.compile(rf"{_EN_LETTER}+(?:\.{_EN_LETTER}+)*")
+EN_SKIP_PATTERN = re.compile(r"https?://\S*|[\w.+-]+@[\w-]+(?:\.[\w-]+)+|(?<!\w)@[\w.-]+|#[\w-]+")
+
+
+def english_keyword_frequencies(texts):
+    """
+    영어 키워드 전용 경로 (Kiwi 미사용) = 어절 분리(split_english_chunks) + 집계(count_english_words)
+    반환값: 내림차순 빈도 Series (동률은 처음 나온 순서)
+    """
+    return count_english_words(split_english_chunks(texts))
+
+
+def split_english_chunks(texts):
+    """소문자화/공백 분리를 Arrow 연산으로 컬럼 전체에 한 번에 처리해 어절 배열을 돌려줍니다."""
+    return pc.list_flatten(pc.utf8_split_whitespace(pc.utf8_lower(pa.array(texts, type=pa.large_string()))))
+
+
+def count_english_words(chunks):
+    """어절 빈도는 Arrow로 세고, 정규식 토큰화와 불용어 필터는 고유 어절에만 적용해 빈도를 나눠 더합니다."""
+    counts = pc.value_counts(chunks)
+    count = Counter()
+    for chunk, n in zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist()):
+        for word in _english_words(chunk):
+            count[word] += n
+    return frequency_series(count)
+
+
+def frequency_series(count):
+    """Counter → 내림차순 빈도 Series (동률은 처음 나온 순서)"""
+    return pd.Series(count, dtype='int64').sort_values(ascending=False, kind='stable')
+
+
+def _english_words(chunk):
+    chunk = EN_SKIP_PATTERN.sub(" ", chunk)
+    return [word for word in EN_WORD_PATTERN.findall(chunk) if len(word) > 2 and word not in STOP_WORDS_EN]
+
+
+def document_keywords(texts, lang_option):
+    """
+    문서마다 키워드 Counter 목록 (keyword_frequencies와 같은 토큰화/불용어 기준)
+    한국어는 Kiwi 배치 토큰화 결과를 문서별로, 영어는 Arrow로 (문서, 어절) 빈도를 센 뒤 고유 어절만 정규식으로 나눕니다.
+    """
+    if lang_option == LANG_EN:
+        lists = pc.utf8_split_whitespace(pc.utf8_lower(pa.array(texts, type=pa.large_string())))
+        counts = pa.table({'doc': pc.list_parent_indices(lists), 'chunk': pc.list_flatten(lists)}) \
+            .group_by(['doc', 'chunk']).aggregate([([], 'count_all')])
+        docs = [Counter() for _ in texts]
+        words_by_chunk = {}
+        for doc, chunk, n in zip(counts['doc'].to_pylist(), counts['chunk'].to_pylist(), counts['count_all'].to_pylist()):
+            words = words_by_chunk.get(chunk)
+            if words is None:
+                words = words_by_chunk[chunk] = _english_words(chunk)
+            for word in words:
+                docs[doc][word] += n
+        return docs
+
+    return [Counter(_korean_nouns(tokens)) for tokens in tokenize_korean(texts)]
+
+
+# --- 🗃️ 키워드 분석 결과 캐시 (데이터 지문 + 언어 + 불용어 기준 LRU) ---
+KEYWORD_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class KeywordCache:
+    """
+    키워드 빈도표를 보관하는 LRU 캐시 (스레드 안전)
+    저장된 빈도표의 메모리 합이 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, old_bytes) = self.entries.popitem(last=False)
+                self.total_bytes -= old_bytes
+
+
+@lru_cache(maxsize=None)
+def get_keyword_cache():
+    return KeywordCache(KEYWORD_CACHE_MAX_BYTES)
+
+
+def column_fingerprint(series):
+    """컬럼 내용의 해시 (행 순서 포함). 같은 데이터면 세션이 달라도 같은 값이 나옵니다."""
+    row_hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def _stopword_key(stop_words):
+    return hashlib.blake2b("\n".join(sorted(stop_words)).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def keyword_frequencies(df, col_name, lang_option):
+    """
+    전체 키워드 빈도표(내림차순 Series)를 돌려줍니다.
+    데이터 지문/언어/불용어가 같으면 캐시된 빈도표를 그대로 쓰므로 다시 토큰화하지 않습니다.
+    """
+    texts = df[col_name].dropna().astype(str)
+    key = keyword_cache_key(texts, lang_option)
+
+    cache = get_keyword_cache()
+    freq = cache.get(key)
+    if freq is None:
+        if lang_option == LANG_EN:
+            with metrics.span('analysis.english_tokenize'):
+                freq = english_keyword_frequencies(texts)
+        else:
+            texts = texts.tolist()
+            with metrics.span('analysis.kiwi_tokenize'):
+                counts = extract_keywords(texts)
+            freq = frequency_series(counts)
+        cache.put(key, freq, int(freq.memory_usage(deep=True)))
+    return freq
+
+
+def keyword_cache_key(texts, lang_option):
+    """키워드 캐시 키: (데이터 지문, 언어, 불용어 지문)"""
+    stop_words = STOP_WORDS_KR if lang_option == LANG_KR else STOP_WORDS_EN
+    return column_fingerprint(texts), lang_option, _stopword_key(stop_words)
+
+
+# --- ☁️ 워드 클라우드 렌더링 (PNG 바이트 캐시) ---
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+WORDCLOUD_WIDTH = 600
+WORDCLOUD_HEIGHT = 400
+WORDCLOUD_MAX_WORDS = 100
+FONT_CANDIDATES = [
+    os.path.join(APP_DIR, "NanumGothic.ttf"),
+    "NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/**/NanumGothic*.ttf",
+    "/Library/Fonts/NanumGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+
+
+@lru_cache(maxsize=None)
+def resolve_font_path():
+    """한글 폰트 경로를 프로세스 시작 시 한 번만 찾습니다. 없으면 None (WordCloud 기본 폰트)"""
+    for pattern in FONT_CANDIDATES:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def frequency_fingerprint(freq):
+    """빈도표(단어+빈도) 해시"""
+    row_hashes = pd.util.hash_pandas_object(freq, index=True).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def wordcloud_png(frequencies, font_path, width=WORDCLOUD_WIDTH, height=WORDCLOUD_HEIGHT):
+    """워드 클라우드를 matplotlib 없이 바로 PNG 바이트로 만듭니다."""
+    with metrics.span('analysis.wordcloud_layout'):
+        wc = WordCloud(
+            font_path=font_path,
+            background_color='white',
+            width=width,
+            height=height,
+            max_words=WORDCLOUD_MAX_WORDS
+        ).generate_from_frequencies(frequencies)
+    with metrics.span('analysis.wordcloud_png'):
+        buf = io.BytesIO()
+        wc.to_image().save(buf, format='PNG')
+    return buf.getvalue()
@@ -1,28 +1,49 @@
 import streamlit as st
-import requests
 import pandas as pd
 import time
-import random
-import urllib3
-from datetime import datetime, time as dt_time
-from bs4 import BeautifulSoup
-from googleapiclient.discovery import build
-
-# --- 📊 시각화 라이브러리 ---
-from kiwipiepy import Kiwi
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from collections import Counter
-import matplotlib.font_manager as fm
-
-# SSL 경고 메시지 숨기기
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from urllib.parse import urlparse
+from collectors import (
+    http_client, format_http_stats, get_rate_limiter, get_adaptive_limiter, HTTP_MAX_RETRIES,
+    STEAM_LANGUAGES, sync_reviews, sync_reviews_by_language, load_reviews, crawl_discussions, DISCUSSION_COLUMNS,
+    QuotaMeter, get_youtube_service, yt_execute, search_keyword_videos, collect_keyword_comments,
+    extract_video_id, stream_video_comments, YT_SINGLE_COLUMNS,
+    FOURCHAN_BOARDS, fourchan_cache, parse_search_targets, collect_4chan,
+    DC_MIN_RATE, DC_MAX_RATE, crawl_dc_gallery,
+)
+
+from analysis import (
+    LANG_KR, LANG_EN, keyword_frequencies,
+    WORDCLOUD_WIDTH, WORDCLOUD_HEIGHT, WORDCLOUD_MAX_WORDS, resolve_font_path, frequency_fingerprint, wordcloud_png,
+)
+from frames import compact_frame, frame_memory, format_bytes, EXPORT_FORMATS, frame_fingerprint, export_bytes
+from instrumentation import metrics, start_metrics_server
+from jobs import get_job_manager, JobQueueFull, QUEUED, DONE, FAILED, CANCELLED
+from trends import update_keyword_index, count_unindexed, compare_ranges
+from collections import OrderedDict
 
 # 페이지 기본 설정
 st.set_page_config(page_title="Steam & YouTube 데이터 수집기", layout="wide")
 
+# --- ☁️ 워드 클라우드 렌더링 (PNG 바이트 캐시) ---
+WORDCLOUD_FONT_PATH = resolve_font_path()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_wordcloud_png(freq_key, lang_option, font_path, width, height, _frequencies):
+    """
+    빈도표 해시/언어/폰트/크기가 같으면 캐시된 워드 클라우드 PNG를 돌려줍니다. (_frequencies는 해시 대상 아님)
+    """
+    return wordcloud_png(_frequencies, font_path, width, height)
+
+
 # --- 📊 시각화 엔진 (언어별 분석 기능 탑재) ---
-def visualize_data(df, col_name):
+def _visualize_data(df, col_name, key):
     """
     [Final] 언어별 독립 분석 시각화 엔진
     """
@@ -33,64 +54,24 @@ def visualize_data(df, col_name):
     st.subheader(f"📊 {len(df)}개 데이터 키워드 분석")
     
     # 1. 🎛️ 언어 선택 드롭다운
-    # key를 지정하여 위젯 상태가 꼬이지 않게 함
+    # 탭마다 고정 key를 지정하여 재실행 사이에도 위젯 상태가 유지되게 함
     lang_option = st.selectbox(
         "분석할 언어를 선택하세요:",
-        ["🇰🇷 한국어", "🇺🇸 영어"],
+        [LANG_KR, LANG_EN],
         index=0,
-        key=f"lang_select_{random.randint(0, 10000)}" # 탭별 충돌 방지용 랜덤 키 (임시) - 실제로는 고유키 권장
+        key=f"lang_select_{key}"
     )
     
     with st.spinner(f"💬 {lang_option} 데이터를 추출하고 분석 중입니다..."):
         try:
-            kiwi = Kiwi()
+            # 2. 토큰화 및 키워드 추출 + 빈도수 계산 (캐시 적중 시 즉시 반환)
+            freq = keyword_frequencies(df, col_name, lang_option)
             
-            # 2. 불용어(Stopwords) 정의
-            stop_words_kr = {
-                '게임', '진짜', '너무', '아니', '근데', '솔직히', '그냥', '이거', '정말', 
-                '생각', '사람', '하고', '해서', '있는', '없는', '입니다', '합니다', '그게', '존나', '때문에',
-                '스팀', '플레이', '정도', '하나', '지금', '일단', '뭔가', '보고', '하면', '해서', '하게', '같아요', '좋아요'
-            }
-            
-            stop_words_en = {
-                'the', 'a', 'an', 'is', 'are', 'was', 'were', 'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'it', 'this', 'that',
-                'and', 'but', 'or', 'so', 'if', 'not', 'no', 'yes', 'can', 'will', 'my', 'your', 'he', 'she', 'they', 'we',
-                'game', 'games', 'play', 'playing', 'player', 'played', 'review', 'steam', 'fun', 'good', 'bad', 'best', 'like', 'just', 'more',
-                'time', 'story', 'really', 'very', 'much', 'get', 'even', 'make', 'made', 'about', 'from', 'out'
-            }
-            
-            # 3. 텍스트 전처리
-            text_list = df[col_name].dropna().astype(str).tolist()
-            full_text = " ".join(text_list)
-            
-            if len(full_text) > 100000:
-                full_text = full_text[:100000]
-                st.caption("※ 데이터가 너무 많아 분석 속도를 위해 일부 텍스트만 샘플링했습니다.")
-
-            # 4. 토큰화 및 키워드 추출
-            tokens = kiwi.tokenize(full_text)
-            keywords = []
-
-            if lang_option == "🇰🇷 한국어":
-                for t in tokens:
-                    if t.tag in ['NNG', 'NNP'] and len(t.form) > 1:
-                        if t.form not in stop_words_kr:
-                            keywords.append(t.form)
-                            
-            elif lang_option == "🇺🇸 영어":
-                for t in tokens:
-                    if t.tag == 'SL' and len(t.form) > 2:
-                        word_lower = t.form.lower()
-                        if word_lower not in stop_words_en:
-                            keywords.append(word_lower)
-            
-            if not keywords:
+            if freq.empty:
                 st.warning(f"선택하신 언어({lang_option})로 작성된 유의미한 단어를 찾을 수 없습니다.")
                 return
 
-            # 5. 빈도수 계산
-            count = Counter(keywords)
-            top_20 = dict(count.most_common(20))
+            top_20 = freq.head(20).to_dict()
 
         except Exception as e:
             st.error(f"분석 중 오류가 발생했습니다: {e}")
@@ -102,28 +83,13 @@ def visualize_data(df, col_name):
     with col_vis1:
         st.markdown(f"#### ☁️ 워드 클라우드 ({lang_option})")
         try:
-            font_path = "NanumGothic.ttf" 
-            try:
-                wc = WordCloud(
-                    font_path=font_path, 
-                    background_color='white',
-                    width=600,
-                    height=400,
-                    max_words=100
-                ).generate_from_frequencies(count)
-            except:
-                wc = WordCloud(
-                    background_color='white',
-                    width=600,
-                    height=400,
-                    max_words=100
-                ).generate_from_frequencies(count)
-
-            fig = plt.figure(figsize=(10, 6))
-            plt.imshow(wc, interpolation='bilinear')
-            plt.axis('off')
-            st.pyplot(fig)
-            if lang_option == "🇰🇷 한국어":
+            top_words = freq.head(WORDCLOUD_MAX_WORDS)
+            png = render_wordcloud_png(
+                frequency_fingerprint(top_words), lang_option, WORDCLOUD_FONT_PATH,
+                WORDCLOUD_WIDTH, WORDCLOUD_HEIGHT, top_words.to_dict()
+            )
+            st.image(png, width='stretch')
+            if lang_option == LANG_KR and WORDCLOUD_FONT_PATH is None:
                 st.caption("※ 한글이 □□로 보인다면 `NanumGothic.ttf` 파일을 업로드해주세요.")
         except Exception as e:
             st.error(f"워드 클라우드 생성 실패: {e}")
@@ -134,7 +100,430 @@ def visualize_data(df, col_name):
         st.bar_chart(top_10, color="#FF4B4B")
         
         with st.expander("📋 상세 데이터 보기"):
-            st.dataframe(pd.DataFrame(list(top_20.items()), columns=['키워드', '빈도수']), use_container_width=True)
+            st.dataframe(pd.DataFrame(list(top_20.items()), columns=['키워드', '빈도수']), width='stretch')
+
+
+def visualize_data(df, col_name, key):
+    """분석/렌더링에 실제로 시간이 든 경우에만 '키워드 분석' 실행으로 진단 패널에 남깁니다."""
+    with diagnosed_run(f"키워드 분석 ({key})", keep_empty=False):
+        _visualize_data(df, col_name, key)
+
+
+# --- 💾 내보내기 (클릭할 때 생성 + 데이터셋 지문 기준 캐시) ---
+@st.cache_data(max_entries=16, show_spinner=False)
+def encode_export(dataset_key, fmt, _df):
+    """데이터셋 지문 + 형식별 내보내기 바이트 (형식마다 한 번만 만듭니다)"""
+    return export_bytes(fmt, _df)
+
+
+def export_buttons(df, file_stem, key, label="다운로드"):
+    """
+    형식별 다운로드 버튼. 바이트는 버튼을 누를 때만(지연 생성) 만들고, 누른 뒤에도 화면을 다시 실행하지 않습니다.
+    """
+    cols = st.columns(len(EXPORT_FORMATS))
+    for col, (fmt, (ext, mime)) in zip(cols, EXPORT_FORMATS.items()):
+        with col:
+            st.download_button(
+                f"{label} ({fmt})", data=lambda fmt=fmt: encode_export(frame_fingerprint(df), fmt, df),
+                file_name=f"{file_stem}.{ext}", mime=mime, key=f"export_{key}_{ext}", on_click="ignore"
+            )
+
+
+# --- 🧮 세션 데이터셋 (dtype 압축 + 세션당 메모리 예산) ---
+SESSION_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+def store_dataset(name, df):
+    """
+    압축한 프레임을 session_state[name]에 넣고, 세션 전체가 예산을 넘으면 가장 오래된 데이터셋부터 비웁니다.
+    반환값: 저장된(압축된) 프레임
+    """
+    before = frame_memory(df)
+    with metrics.span('dataframe.compact'):
+        df = compact_frame(df)
+    sizes = st.session_state.setdefault('_dataset_sizes', OrderedDict())
+    sizes.pop(name, None)
+    sizes[name] = (frame_memory(df), before)
+    st.session_state[name] = df
+
+    while sum(size for size, _ in sizes.values()) > SESSION_MEMORY_BUDGET and len(sizes) > 1:
+        oldest = next(iter(sizes))
+        del sizes[oldest]
+        st.session_state.pop(oldest, None)
+    return df
+
+
+def dataset_caption(name):
+    """데이터셋 메모리 사용량 한 줄 (압축 전 대비)"""
+    size, before = st.session_state.get('_dataset_sizes', {}).get(name, (0, 0))
+    if size:
+        st.caption(f"💾 메모리 {format_bytes(size)} (압축 전 {format_bytes(before)})")
+
+
+# --- 🩺 진단 (단계별 계측, 마지막 실행 기록) ---
+METRICS_PORT = os.environ.get("METRICS_PORT")  # 설정하면 이 포트에서 Prometheus /metrics 제공
+DIAGNOSTIC_RUNS_KEPT = 5
+
+if METRICS_PORT:
+    start_metrics_server(int(METRICS_PORT))
+
+
+@contextmanager
+def diagnosed_run(label, keep_empty=True):
+    """
+    with 블록 동안의 계측을 모아 사이드바 진단 패널용으로 session_state에 남깁니다. (최근 DIAGNOSTIC_RUNS_KEPT개)
+    keep_empty=False면 아무 단계도 기록되지 않은 실행(예: 캐시 적중뿐인 재실행)은 남기지 않습니다.
+    """
+    try:
+        with metrics.run(label) as run:
+            yield run
+    finally:
+        if metrics.enabled and (keep_empty or run.totals.spans):
+            remember_diagnostics(run.as_dict())
+
+
+def remember_diagnostics(run):
+    """실행 기록(MetricRun.as_dict())을 같은 이름의 이전 기록 대신 넣습니다."""
+    runs = st.session_state.setdefault('_diagnostic_runs', OrderedDict())
+    runs.pop(run['label'], None)
+    runs[run['label']] = run
+    while len(runs) > DIAGNOSTIC_RUNS_KEPT:
+        runs.popitem(last=False)
+
+
+def render_diagnostics():
+    """마지막 실행들의 단계별 시간과 호스트별 HTTP 통계 (사이드바 진단 패널)"""
+    runs = st.session_state.get('_diagnostic_runs')
+    if not runs:
+        st.caption("아직 기록된 실행이 없습니다." if metrics.enabled else "계측이 꺼져 있습니다. (METRICS_ENABLED=0)")
+        return
+    label = st.selectbox("실행", list(reversed(runs)), key="diagnostic_run")
+    run = runs[label]
+    started = datetime.fromtimestamp(run['started_at']).strftime('%H:%M:%S')
+    st.caption(f"{started} 시작 · 전체 {run['seconds']:.2f}초")
+    if run['spans']:
+        spans = pd.DataFrame([
+            {'단계': name, '호출': v['count'], '누적(초)': round(v['seconds'], 3), '최대(초)': round(v['max'], 3)}
+            for name, v in run['spans'].items()
+        ]).sort_values('누적(초)', ascending=False)
+        st.dataframe(spans, hide_index=True, width='stretch')
+    if run['http']:
+        hosts = pd.DataFrame([
+            {'호스트': host, '요청': v['requests'], '재시도': v['retries'],
+             '상태': " ".join(f"{code}×{n}" for code, n in sorted(v['status'].items())),
+             '수신': format_bytes(v['bytes']), '평균(ms)': round(v['seconds'] / v['requests'] * 1000) if v['requests'] else 0}
+            for host, v in run['http'].items()
+        ])
+        st.dataframe(hosts, hide_index=True, width='stretch')
+    st.download_button("JSON 내보내기", data=json.dumps(run, ensure_ascii=False, indent=2).encode('utf-8'),
+                       file_name="diagnostics.json", mime="application/json", key="diagnostics_json", on_click="ignore")
+    if METRICS_PORT:
+        st.caption(f"Prometheus: `:{METRICS_PORT}/metrics` (프로세스 누적)")
+
+
+# --- 🧵 백그라운드 수집 작업 (프로세스 공용 워커 풀 + 화면은 주기적으로 진행 상황만 읽음) ---
+JOB_POLL_SECONDS = 1.0
+job_manager = get_job_manager()
+
+
+def start_job(slot, key, label, func):
+    """
+    func(job)을 백그라운드 작업으로 제출하고 이 세션의 slot(탭)에 연결합니다.
+    같은 조건(key)의 작업이 이미 진행 중이면 새로 돌리지 않고 그 작업에 합류하며,
+    slot에 연결돼 있던 이전 작업은 이 세션이 손을 뗍니다. (보는 세션이 없으면 취소)
+    HTTP 재시도 횟수는 제출 시점의 사이드바 값을 이 작업에만 적용합니다.
+    key에는 결과나 비용(속도, API 할당량)을 바꾸는 설정을 모두 넣어야 설정이 다른 세션이 잘못 합류하지 않습니다.
+    (재시도 횟수는 여기서 덧붙입니다)
+    """
+    max_retries = st.session_state.get('http_max_retries', HTTP_MAX_RETRIES)
+    try:
+        job, joined = job_manager.submit(key + (max_retries,), label, partial(run_with_retry_limit, func, max_retries))
+    except JobQueueFull as e:
+        st.error(str(e))
+        return
+    jobs = st.session_state.setdefault('_jobs', {})
+    previous = jobs.get(slot)
+    if previous is not None:
+        job_manager.release(previous)  # 같은 작업을 다시 누른 경우엔 방금 늘어난 구독만 되돌림
+    jobs[slot] = job.id
+    if joined and previous != job.id:
+        st.info(f"같은 조건의 수집이 이미 진행 중이라 그 작업(#{job.id})에 합류했습니다.")
+
+
+def api_key_fingerprint(api_key):
+    """작업 키에 넣을 API 키 지문 (같은 키 = 같은 할당량, 키 원문은 남기지 않음)"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+def run_with_retry_limit(func, max_retries, job):
+    with http_client.retry_limit(max_retries):
+        return func(job)
+
+
+def slot_job(slot):
+    job_id = st.session_state.get('_jobs', {}).get(slot)
+    if job_id is None:
+        return None
+    job = job_manager.get(job_id)
+    if job is None:
+        del st.session_state['_jobs'][slot]  # 보관 시간이 지나 정리된 작업
+    return job
+
+
+def take_finished_job(slot):
+    """
+    끝난 작업을 세션에서 떼어 상태 알림/로그를 보여 주고 (작업, 결과)를 돌려줍니다. (결과는 한 번만 반영) 진행 중이거나 없으면 (None, None)
+    결과: 완료면 작업 반환값(원래 순서), 반환값이 없거나 취소/실패면 그때까지 도착한 부분 결과
+    가져간 뒤에는 작업 쪽 행을 비우므로(마지막 세션 기준) 결과는 세션에 저장해서 씁니다.
+    """
+    job = slot_job(slot)
+    if job is None or job.active:
+        return None, None
+    del st.session_state['_jobs'][slot]
+    job_outcome(job)
+    if job.diagnostics:
+        remember_diagnostics(job.diagnostics)
+    return job, job_manager.take(job.id)
+
+
+def job_outcome(job):
+    """끝난 작업의 상태 알림과 작업 로그"""
+    snap = job.snapshot()
+    if job.state == CANCELLED:
+        st.warning(f"수집을 취소했습니다. (#{job.id} · 부분 결과 {snap['rows']:,}행)")
+    elif job.state == FAILED:
+        st.error(f"오류: {job.error}")
+    if snap['logs']:
+        with st.expander(f"작업 로그 (#{job.id} · {snap['elapsed']:.0f}초)", expanded=job.state != DONE):
+            for line in snap['logs']:
+                st.write(line)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(slot, columns=None):
+    """
+    진행 중인 작업의 진행 막대/최근 로그/부분 결과와 취소 버튼. (이 부분만 JOB_POLL_SECONDS마다 다시 그림)
+    작업이 끝나면 결과를 반영하도록 화면 전체를 다시 실행합니다.
+    """
+    job = slot_job(slot)
+    if job is None or not job.active:
+        st.rerun()
+    snap = job.snapshot()
+    if snap['state'] == QUEUED:
+        st.info(f"⏳ 대기 중... (#{snap['id']})")
+    elif snap['total']:
+        st.progress(min(snap['done'] / snap['total'], 1.0), text=snap['message'])
+    else:
+        st.info(snap['message'])
+    for line in snap['logs'][-5:]:
+        st.caption(line)
+    if snap['rows'] and columns is not None:
+        st.dataframe(pd.DataFrame.from_records(job.partial_rows(), columns=columns))
+    elif snap['rows']:
+        st.caption(f"부분 결과 {snap['rows']:,}행")
+
+    col_info, col_cancel = st.columns([4, 1])
+    with col_info:
+        shared = f" · 함께 보는 세션 {snap['subscribers']}개" if snap['subscribers'] > 1 else ""
+        st.caption(f"작업 #{snap['id']} · {snap['elapsed']:.0f}초 경과{shared} · 다른 탭/설정을 눌러도 계속 진행됩니다.")
+    with col_cancel:
+        if st.button("⏹ 취소", key=f"cancel_{slot}"):
+            if job.snapshot()['subscribers'] > 1:
+                job_manager.release(job.id)
+                del st.session_state['_jobs'][slot]  # 다른 세션이 보고 있으면 이 세션만 빠짐
+            else:
+                job_manager.cancel(job.id)  # 부분 결과는 끝난 뒤 take_finished_job으로 가져감
+            st.rerun()
+
+
+# --- 🧵 수집 작업 함수 (백그라운드 스레드에서 실행: st.* 호출 금지, 진행은 job으로만 알림) ---
+def run_review_job(job, app_id, language, start_date, parallel):
+    def show_progress(fetched, oldest_ts):
+        curr_date = datetime.fromtimestamp(oldest_ts, timezone.utc).date()
+        job.update(done=fetched, message=f"새 리뷰 {fetched}개 수집됨... (현재 탐색 위치: {curr_date})")
+
+    def show_stream_progress(fetched, target, eta):
+        eta_text = f"약 {int(eta)}초 남음" if eta is not None else "남은 시간 계산 중"
+        job.update(done=fetched, total=target,
+                   message=f"언어별 {len(STEAM_LANGUAGES)}개 스트림 수집 중... 새 리뷰 {fetched}/{target}개 ({eta_text})")
+
+    http_before = http_client.stats()
+    try:
+        if parallel:
+            fetched = sync_reviews_by_language(app_id, start_date, on_progress=show_stream_progress)
+        else:
+            fetched = sync_reviews(app_id, language, start_date, on_progress=show_progress,
+                                   on_target=lambda target: job.update(total=target))
+    finally:
+        job.log(format_http_stats(http_before, http_client.stats()))
+    return fetched
+
+
+def run_index_job(job, app_id):
+    def show_progress(lang_option, done, remaining):
+        job.update(done=done, total=done + remaining, message=f"키워드 색인 ({lang_option}) {done:,}/{done + remaining:,}")
+
+    indexed = update_keyword_index(app_id, on_progress=show_progress)
+    job.log("🗂️ 키워드 색인: " + " · ".join(f"{lang} {n:,}개" for lang, n in indexed.items()))
+
+
+def run_discussion_job(job, target_url, pages, requests_per_sec):
+    def show_progress(pages_done, topics_done, topics_total):
+        job.update(done=topics_done, total=topics_total or None,
+                   message=f"{pages_done}/{pages}페이지 탐색, 토론글 {topics_done}/{topics_total}개 수집 완료")
+
+    http_before = http_client.stats()
+    try:
+        limiter = get_rate_limiter(urlparse(target_url).netloc, requests_per_sec)
+        rows, failed_topics = crawl_discussions(target_url, pages, limiter, on_progress=show_progress, on_rows=job.add_rows)
+    finally:
+        job.log(format_http_stats(http_before, http_client.stats()))
+    if failed_topics:
+        job.log(f"⚠️ 토론글 {failed_topics}개는 재시도 후에도 가져오지 못했습니다.")
+    return rows
+
+
+def run_yt_keyword_job(job, api_key, keyword, start_date, end_date, max_videos, max_comments, min_view_count):
+    quota = QuotaMeter()
+
+    def show_progress(done, total, video, n_comments, error):
+        v_title = video['snippet']['title']
+        job.log(f"⚠️ {v_title[:30]}... 댓글 {n_comments}개 ({error})" if error else f"✅ {v_title[:30]}... 댓글 {n_comments}개")
+        job.update(done=done, total=total, message=f"영상 {done}/{total}개 · {quota.summary()}")
+
+    try:
+        youtube = get_youtube_service(api_key)
+        job.update(message="영상 검색 중...")
+        found_count, target_videos = search_keyword_videos(
+            youtube, keyword, start_date, end_date, max_videos, min_view_count, quota
+        )
+        if not found_count:
+            job.log("검색된 영상이 없습니다.")
+            return []
+        if not target_videos:
+            job.log("조회수 조건을 만족하는 영상이 없습니다.")
+            return []
+        return collect_keyword_comments(youtube, target_videos, max_comments, quota,
+                                        on_progress=show_progress, on_rows=job.add_rows)
+    finally:
+        job.log(quota.summary())
+
+
+def run_yt_single_job(job, api_key, video_id, max_comments, include_replies):
+    quota = QuotaMeter()
+
+    def on_rows(rows):
+        job.add_rows(rows)
+        job.update(message=f"댓글 {job.snapshot()['rows']:,}개 수집 중... · {quota.summary()}")
+
+    try:
+        youtube = get_youtube_service(api_key)
+        video_response = yt_execute(youtube, 'videos', quota, part='snippet,statistics', id=video_id)
+        if not video_response.get('items'):
+            raise LookupError("영상을 찾을 수 없습니다.")
+        v_title = video_response['items'][0]['snippet']['title']
+        job.log(f"📺 분석 대상: {v_title}")
+        failed = stream_video_comments(youtube, video_id, v_title, max_comments, quota, on_rows, include_replies)
+        if failed:
+            job.log(f"⚠️ 답글을 받지 못한 댓글 {failed}개")
+    finally:
+        job.log(quota.summary())
+
+
+def run_4chan_job(job, targets, boards, limit):
+    http_before = http_client.stats()
+    cache_before = fourchan_cache.stats()
+    job.update(message="카탈로그 색인 중...")
+    rows, n_indexed, n_threads, failed = collect_4chan(
+        targets, boards, limit,
+        on_progress=lambda done, total: job.update(done=done, total=total, message=f"스레드 {done}/{total}개 수집")
+    )
+    cache_after = fourchan_cache.stats()
+    job.log(f"✅ {n_indexed}개 스레드 색인 · 검색어 {len(targets)}개 · {n_threads}개 스레드 수집")
+    if failed:
+        job.log(f"⚠️ 스레드 {failed}개는 재시도 후에도 가져오지 못했습니다.")
+    job.log(format_http_stats(http_before, http_client.stats()))
+    job.log(f"캐시: 요청 생략 {cache_after['fresh'] - cache_before['fresh']}건 · "
+            f"304 {cache_after['not_modified'] - cache_before['not_modified']}건 · "
+            f"새로 받음 {cache_after['fetched'] - cache_before['fetched']}건")
+    return rows
+
+
+def run_dc_job(job, gallery_id, is_minor, keyword, pages, fetch_posts, max_rate):
+    limiter = get_adaptive_limiter("gall.dcinside.com", DC_MIN_RATE, max_rate)
+    backoffs_before = limiter.backoffs
+    http_before = http_client.stats()
+
+    def show_progress(pages_done, posts_done, posts_total):
+        job.update(done=pages_done + posts_done, total=pages + posts_total,
+                   message=f"목록 {pages_done}/{pages} · 본문 {posts_done}/{posts_total} · 현재 {limiter.rate:.2f}회/초")
+
+    try:
+        rows, failed, list_error = crawl_dc_gallery(gallery_id, is_minor, keyword, pages, limiter, fetch_posts, show_progress)
+    finally:
+        job.log(format_http_stats(http_before, http_client.stats()))
+        job.log(f"🚦 최종 속도 {limiter.rate:.2f}회/초 · 감속 {limiter.backoffs - backoffs_before}회")
+    if list_error:
+        job.log(f"❌ 접속 실패: {list_error}")
+    if failed:
+        job.log(f"⚠️ 본문을 받지 못한 게시글 {failed}개")
+    return rows
+
+
+def start_index_job(app_id):
+    start_job('trend_index', ('trend_index', app_id), f"키워드 색인 {app_id}", partial(run_index_job, app_id=app_id))
+
+
+# --- 📈 기간별 키워드 변화 (일별 색인을 합쳐서 계산, 다시 토큰화하지 않음) ---
+TREND_TOP_N = 15
+
+
+def render_trends(app_id, language, start_date, end_date):
+    """기준일 이전/이후 두 기간의 키워드 빈도(리뷰 1000개당)를 비교해 상승/하락 키워드를 보여줍니다."""
+    st.divider()
+    st.subheader("📈 기간별 키워드 변화")
+    lang_option = st.selectbox("분석할 언어를 선택하세요:", [LANG_KR, LANG_EN], index=0, key="trend_lang")
+
+    job, _ = take_finished_job('trend_index')
+    if job is None and slot_job('trend_index'):
+        job_progress('trend_index')
+    elif job is None:
+        pending = count_unindexed(app_id, lang_option)
+        if pending:
+            st.caption(f"아직 색인하지 않은 리뷰 {pending:,}개는 비교에서 빠집니다.")
+            if st.button("키워드 색인 갱신", key="btn_trend_index"):
+                start_index_job(app_id)
+                st.rerun()
+
+    if start_date >= end_date:
+        st.info("두 기간으로 나누려면 수집 기간이 이틀 이상이어야 합니다.")
+        return
+    split_date = st.date_input("기준일 (예: 패치 날짜, 이 날부터 '이후')", value=start_date + timedelta(days=max((end_date - start_date).days // 2, 1)),
+                               min_value=start_date + timedelta(days=1), max_value=end_date, key="trend_split")
+
+    with diagnosed_run("기간별 키워드 변화"):
+        table, n_before, n_after = compare_ranges(
+            app_id, lang_option, language, (start_date, split_date - timedelta(days=1)), (split_date, end_date)
+        )
+    st.caption(f"이전 {start_date} ~ {split_date - timedelta(days=1)}: 리뷰 {n_before:,}개 · "
+               f"이후 {split_date} ~ {end_date}: 리뷰 {n_after:,}개 (리뷰 1000개당 빈도 차이)")
+    if table.empty or not n_before or not n_after:
+        st.info("비교할 키워드가 없습니다. 두 기간 모두에 색인된 리뷰가 있어야 합니다.")
+        return
+
+    risers = table[table['변화'] > 0]['변화'].head(TREND_TOP_N)
+    fallers = table[table['변화'] < 0]['변화'].tail(TREND_TOP_N).sort_values()
+    col_up, col_down = st.columns(2)
+    with col_up:
+        st.markdown(f"#### 🔺 상승 Top {TREND_TOP_N}")
+        if risers.empty: st.caption("없음")
+        else: st.bar_chart(risers, horizontal=True, sort=False, color="#FF4B4B")
+    with col_down:
+        st.markdown(f"#### 🔻 하락 Top {TREND_TOP_N}")
+        if fallers.empty: st.caption("없음")
+        else: st.bar_chart(fallers, horizontal=True, sort=False, color="#1F77B4")
+    with st.expander("📋 상세 데이터 보기"):
+        st.dataframe(table.round(2), width='stretch')
 
 
 # --- 🔐 비밀번호 잠금 ---
@@ -149,6 +538,8 @@ st.title("Steam & YouTube 데이터 수집기 (Visualized)")
 with st.sidebar:
     st.header("설정")
     menu = st.selectbox("분석 채널", ["Steam (스팀)", "YouTube (유튜브)", "4chan (해외 포럼)", "디시인사이드"])
+    st.number_input("HTTP 최대 재시도 횟수", min_value=0, max_value=10, value=HTTP_MAX_RETRIES, key="http_max_retries",
+                    help="429/5xx/연결 오류 시 지수 백오프로 다시 시도합니다. (Retry-After 헤더 우선, 이후 시작하는 수집에 적용)")
     st.divider()
     st.info("💡 **시각화 기능 안내**\n\n'Steam 리뷰'와 'YouTube 댓글' 수집 시에만 하단에 워드 클라우드와 분석 차트가 나타납니다.")
 
@@ -173,65 +564,50 @@ if menu == "Steam (스팀)":
         with col_end:
             end_date = st.date_input("수집 종료 날짜", datetime.now())
         
-        # 버튼 클릭 시 수집 실행
+        parallel_langs = False
+        if language == "all":
+            parallel_langs = st.checkbox("언어별 커서 병렬 수집", value=True, help="스팀 언어마다 별도 커서로 동시에 수집합니다.")
+        
+        # 버튼 클릭 시 수집 작업 제출 (저장소에 없는 리뷰만 받아옴, 같은 앱/언어/시작일 작업은 합류)
         if st.button("리뷰 수집 시작", key="btn_review"):
-            all_reviews = []
-            cursor = '*'
-            status_box = st.info(f"데이터 수집 중... (목표 기간: {start_date} ~ {end_date})")
+            start_job('steam_reviews', ('steam_reviews', app_id_review, language, start_date, parallel_langs),
+                      f"스팀 리뷰 {app_id_review} ({language})",
+                      partial(run_review_job, app_id=app_id_review, language=language, start_date=start_date, parallel=parallel_langs))
+
+        job, fetched = take_finished_job('steam_reviews')
+        if job:
+            if job.state == DONE:
+                st.success(f"완료! 새 리뷰 {fetched}개를 저장소에 반영했습니다.")
+            if job.state in (DONE, CANCELLED):
+                # 💡 [핵심 변경] 수집 대상만 Session State에 기억하고, 데이터는 저장소에서 읽음 (취소해도 받은 페이지는 저장돼 있음)
+                st.session_state['steam_source'] = job.key[1:3]
+                st.session_state['steam_revision'] = time.time()
+                # 리뷰는 바로 보여 주고, 새 리뷰의 키워드 색인(기간별 키워드 변화용)은 이어지는 작업으로 돌립니다.
+                start_index_job(job.key[1])
+        elif slot_job('steam_reviews'):
+            job_progress('steam_reviews')
+
+        # 💡 [화면 표시] 기간을 바꾸면 네트워크 없이 저장소에서 다시 읽어옴
+        if st.session_state.get('steam_source'):
+            view_key = (st.session_state['steam_source'], start_date, end_date, st.session_state.get('steam_revision'))
+            if st.session_state.get('steam_view_key') != view_key or 'steam_data' not in st.session_state:
+                with diagnosed_run("스팀 리뷰 불러오기"):
+                    store_dataset('steam_data', load_reviews(*st.session_state['steam_source'], start_date, end_date))
+                st.session_state['steam_view_key'] = view_key
             
-            try:
-                for i in range(200): 
-                    params = {
-                        'json': 1, 'cursor': cursor, 'language': language,
-                        'num_per_page': 100, 'purchase_type': 'all', 'filter': 'recent'
-                    }
-                    res = requests.get(f"https://store.steampowered.com/appreviews/{app_id_review}", params=params, verify=False)
-                    data = res.json()
-                    
-                    if 'reviews' in data and len(data['reviews']) > 0:
-                        last_ts = data['reviews'][-1]['timestamp_created']
-                        curr_date = pd.to_datetime(last_ts, unit='s').date()
-                        
-                        for r in data['reviews']:
-                            r_date = pd.to_datetime(r['timestamp_created'], unit='s').date()
-                            if r_date > end_date: continue
-                            if r_date < start_date: pass 
-                            
-                            if start_date <= r_date <= end_date:
-                                all_reviews.append({
-                                    '작성일': r_date, 
-                                    '내용': r['review'].replace('\n', ' '), 
-                                    '추천수': r['votes_up'],
-                                    '플레이시간(분)': r['author'].get('playtime_forever', 0)
-                                })
-                        
-                        cursor = data['cursor']
-                        status_box.info(f"현재 {len(all_reviews)}개 수집됨... (현재 탐색 위치: {curr_date})")
-                        if curr_date < start_date: break
-                    else: break
-                
-                if all_reviews:
-                    df = pd.DataFrame(all_reviews)
-                    df = df.sort_values(by='작성일', ascending=False)
-                    status_box.success(f"완료! {start_date} ~ {end_date} 기간의 리뷰 {len(df)}개를 수집했습니다.")
-                    
-                    # 💡 [핵심 변경] 수집된 데이터를 Session State에 영구 저장
-                    st.session_state['steam_data'] = df
-                else:
-                    st.warning("해당 기간에 작성된 리뷰가 없습니다.")
-                    if 'steam_data' in st.session_state:
-                        del st.session_state['steam_data']
-            except Exception as e:
-                st.error(f"오류 발생: {e}")
-
-        # 💡 [화면 표시] 버튼 블록 밖에서 Session State에 데이터가 있으면 보여줌
-        if 'steam_data' in st.session_state and st.session_state['steam_data'] is not None:
             df = st.session_state['steam_data']
-            st.dataframe(df)
-            st.download_button("엑셀 다운로드", df.to_csv(index=False).encode('utf-8-sig'), "steam_reviews.csv")
-            
-            # 🔥 [시각화 엔진 가동] - 이제 드롭다운 바꿔도 안 사라짐!
-            visualize_data(df, "내용")
+            if df.empty:
+                st.warning("해당 기간에 작성된 리뷰가 없습니다.")
+            else:
+                src_app, src_lang = st.session_state['steam_source']
+                st.success(f"App {src_app} ({src_lang}) · {start_date} ~ {end_date} 기간의 리뷰 {len(df)}개")
+                st.dataframe(df)
+                dataset_caption('steam_data')
+                export_buttons(df, "steam_reviews", "steam", "엑셀 다운로드")
+                
+                # 🔥 [시각화 엔진 가동] - 이제 드롭다운 바꿔도 안 사라짐!
+                visualize_data(df, "내용", "steam")
+                render_trends(src_app, src_lang, start_date, end_date)
 
 
     # [TAB 2] 토론장 수집 (시각화 적용 X)
@@ -240,61 +616,28 @@ if menu == "Steam (스팀)":
         st.caption("※ 토론장은 텍스트 구조가 복잡하여 현재 시각화 기능을 지원하지 않습니다.")
         target_url = st.text_input("수집할 토론장 URL", value="https://steamcommunity.com/app/1562700/discussions/")
         pages_to_crawl = st.number_input("탐색할 페이지 수", min_value=1, max_value=20, value=2)
+        requests_per_sec = st.number_input("초당 요청 수 (steamcommunity.com)", min_value=0.5, max_value=10.0, value=3.0, step=0.5)
         
         if st.button("토론글 수집 시작", key="btn_discuss"):
-            discussion_data = []
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            headers = {'User-Agent': 'Mozilla/5.0', 'Accept-Language': 'ko-KR'}
-            cookies = {'wants_mature_content': '1', 'birthtime': '660000001', 'lastagecheckage': '1-January-1990'}
-            
-            try:
-                if not target_url.endswith('/') and '?' not in target_url: target_url += '/'
-                for p in range(pages_to_crawl):
-                    full_url = f"{target_url}?fp={p+1}"
-                    status_text.text(f"{p+1}페이지 수집 중...")
-                    time.sleep(1)
-                    res = requests.get(full_url, headers=headers, cookies=cookies, verify=False)
-                    soup = BeautifulSoup(res.text, 'html.parser')
-                    topic_rows = soup.find_all('div', class_='forum_topic')
-                    
-                    if not topic_rows: break
-                    
-                    for idx, row in enumerate(topic_rows):
-                        try:
-                            link_tag = row.find('a', class_='forum_topic_overlay')
-                            title_tag = row.find('div', class_='forum_topic_name')
-                            if not link_tag: continue
-                            link = link_tag['href']
-                            title = title_tag.text.strip() if title_tag else "제목 없음"
-                            
-                            time.sleep(0.5)
-                            sub_res = requests.get(link, headers=headers, cookies=cookies, verify=False)
-                            sub_soup = BeautifulSoup(sub_res.text, 'html.parser')
-                            
-                            op_div = sub_soup.find('div', class_='forum_op')
-                            if op_div:
-                                author = op_div.find('a', class_='forum_op_author').text.strip()
-                                content = op_div.find('div', class_='content').text.strip()
-                                discussion_data.append({'구분': '게시글', '제목': title, '작성자': author, '내용': content, '링크': link})
-                            
-                            comments = sub_soup.find_all('div', class_='commentthread_comment')
-                            for comm in comments:
-                                c_text = comm.find('div', class_='commentthread_comment_text').text.strip()
-                                c_author = comm.find('a', class_='commentthread_author_link').text.strip()
-                                if c_text:
-                                    discussion_data.append({'구분': '댓글', '제목': f"(Re) {title}", '작성자': c_author, '내용': c_text, '링크': link})
-                        except: continue
-                        progress_bar.progress(min((p / pages_to_crawl) + ((idx + 1) / len(topic_rows) / pages_to_crawl), 0.99))
-                
-                progress_bar.progress(1.0)
-                if discussion_data:
+            start_job('steam_discussion', ('steam_discussion', target_url, pages_to_crawl, requests_per_sec), f"스팀 토론장 {target_url}",
+                      partial(run_discussion_job, target_url=target_url, pages=pages_to_crawl, requests_per_sec=requests_per_sec))
+
+        job, discussion_data = take_finished_job('steam_discussion')
+        if job:
+            if discussion_data:
+                with metrics.span('dataframe.build'):
                     df = pd.DataFrame(discussion_data)
-                    st.success(f"수집 완료! 총 {len(df)}개")
-                    st.dataframe(df)
-                    st.download_button("엑셀 다운로드", df.to_csv(index=False).encode('utf-8-sig'), "steam_discussion.csv")
-                else: st.error("데이터 없음")
-            except Exception as e: st.error(f"오류: {e}")
+                store_dataset('discussion_data', df)
+            elif job.state == DONE: st.error("데이터 없음")
+        elif slot_job('steam_discussion'):
+            job_progress('steam_discussion', columns=DISCUSSION_COLUMNS)
+
+        if st.session_state.get('discussion_data') is not None:
+            df = st.session_state['discussion_data']
+            st.success(f"수집 완료! 총 {len(df)}개")
+            st.dataframe(df)
+            dataset_caption('discussion_data')
+            export_buttons(df, "steam_discussion", "steam_discussion", "엑셀 다운로드")
 
 # =========================================================
 # [SECTION 2] YouTube (유튜브)
@@ -313,6 +656,7 @@ elif menu == "YouTube (유튜브)":
             search_keyword = st.text_input("검색어 (예: Elden Ring Review)", value="Elden Ring")
         with col2:
             max_videos = st.number_input("분석할 영상 수", min_value=1, max_value=50, value=10)
+            max_comments_per_video = st.number_input("영상당 최대 댓글 수", min_value=10, max_value=5000, value=200, step=50)
         
         col_start, col_end, col_view = st.columns([1, 1, 1])
         with col_start:
@@ -326,210 +670,112 @@ elif menu == "YouTube (유튜브)":
             if not yt_api_key:
                 st.error("맨 위에 YouTube API Key를 먼저 입력해주세요.")
             else:
-                status_box = st.status("데이터 수집 및 분석 중...", expanded=True)
-                youtube_data = []
-                
-                try:
-                    youtube = build('youtube', 'v3', developerKey=yt_api_key)
-                    start_dt = datetime.combine(start_date_yt, dt_time.min).isoformat() + "Z"
-                    end_dt = datetime.combine(end_date_yt, dt_time.max).isoformat() + "Z"
-                    
-                    search_response = youtube.search().list(
-                        q=search_keyword, type='video', part='id', order='viewCount',
-                        publishedAfter=start_dt, publishedBefore=end_dt, maxResults=max_videos
-                    ).execute()
-                    
-                    video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
-                    
-                    if not video_ids:
-                        status_box.update(label="검색된 영상이 없습니다.", state="error")
-                    else:
-                        stats_response = youtube.videos().list(
-                            part='snippet,statistics', id=','.join(video_ids)
-                        ).execute()
-                        
-                        target_videos = []
-                        for v_item in stats_response.get('items', []):
-                            views = int(v_item['statistics'].get('viewCount', 0))
-                            if views >= min_view_count:
-                                target_videos.append(v_item)
-                        
-                        if not target_videos:
-                            status_box.update(label="조회수 조건을 만족하는 영상이 없습니다.", state="error")
-                        else:
-                            prog_bar = st.progress(0)
-                            for idx, video in enumerate(target_videos):
-                                vid = video['id']
-                                v_title = video['snippet']['title']
-                                v_views = video['statistics'].get('viewCount', 0)
-                                v_date = video['snippet']['publishedAt'][:10]
-                                
-                                status_box.write(f"Collecting comments from: {v_title[:30]}...")
-                                
-                                try:
-                                    comment_request = youtube.commentThreads().list(
-                                        part="snippet", videoId=vid, maxResults=50, textFormat="plainText", order="relevance"
-                                    )
-                                    comment_response = comment_request.execute()
-                                    
-                                    for item in comment_response.get('items', []):
-                                        c_snip = item['snippet']['topLevelComment']['snippet']
-                                        youtube_data.append({
-                                            '영상제목': v_title, '조회수': v_views, '영상게시일': v_date,
-                                            '작성자': c_snip['authorDisplayName'], '댓글내용': c_snip['textDisplay'],
-                                            '좋아요': c_snip['likeCount'], '댓글작성일': c_snip['publishedAt'][:10]
-                                        })
-                                except: pass
-                                prog_bar.progress((idx + 1) / len(target_videos))
-                            
-                            status_box.update(label="수집 완료!", state="complete")
-                            
-                            if youtube_data:
-                                df_yt = pd.DataFrame(youtube_data)
-                                st.session_state['yt_keyword_data'] = df_yt # 저장
-                            else: st.warning("댓글을 찾을 수 없습니다.")
-                except Exception as e:
-                    status_box.update(label="에러 발생", state="error")
-                    st.error(f"오류: {e}")
+                start_job('yt_keyword',
+                          ('yt_keyword', api_key_fingerprint(yt_api_key), search_keyword, start_date_yt, end_date_yt, max_videos,
+                           max_comments_per_video, min_view_count),
+                          f"YouTube 키워드 {search_keyword}",
+                          partial(run_yt_keyword_job, api_key=yt_api_key, keyword=search_keyword, start_date=start_date_yt,
+                                  end_date=end_date_yt, max_videos=max_videos, max_comments=max_comments_per_video,
+                                  min_view_count=min_view_count))
+
+        job, youtube_data = take_finished_job('yt_keyword')
+        if job:
+            if youtube_data:
+                with metrics.span('dataframe.build'):
+                    df_keyword = pd.DataFrame(youtube_data)
+                store_dataset('yt_keyword_data', df_keyword) # 저장
+            elif job.state == DONE: st.warning("댓글을 찾을 수 없습니다.")
+        elif slot_job('yt_keyword'):
+            job_progress('yt_keyword')
 
         # 💡 [화면 표시] YouTube Keyword
         if 'yt_keyword_data' in st.session_state and st.session_state['yt_keyword_data'] is not None:
             df_yt = st.session_state['yt_keyword_data']
             st.dataframe(df_yt)
-            st.download_button("결과 다운로드", df_yt.to_csv(index=False).encode('utf-8-sig'), f"yt_keyword_{search_keyword}.csv")
-            visualize_data(df_yt, "댓글내용")
+            dataset_caption('yt_keyword_data')
+            export_buttons(df_yt, f"yt_keyword_{search_keyword}", "yt_keyword", "결과 다운로드")
+            visualize_data(df_yt, "댓글내용", "yt_keyword")
 
     # [TAB 2] 개별 영상 링크 (Session State 적용)
     with tab_yt2:
         st.caption("개별 영상의 댓글을 집중적으로 분석합니다.")
         target_url = st.text_input("YouTube 영상 주소 (URL)", placeholder="예: https://www.youtube.com/watch?v=...")
-        max_comments_single = st.number_input("수집할 댓글 수 (최대)", min_value=10, max_value=500, value=100, step=10)
+        max_comments_single = st.number_input("수집할 댓글 수 (최대, 답글 제외)", min_value=10, max_value=20000, value=100, step=10)
+        include_replies = st.checkbox("답글까지 수집", value=True, key="yt_include_replies")
 
         if st.button("단일 영상 댓글 수집", key="btn_yt_link"):
             if not yt_api_key or not target_url:
                 st.error("API Key와 영상 주소를 확인해주세요.")
             else:
-                video_id = None
-                if "v=" in target_url: video_id = target_url.split("v=")[1].split("&")[0]
-                elif "youtu.be" in target_url: video_id = target_url.split("/")[-1].split("?")[0]
+                video_id = extract_video_id(target_url)
                 
                 if not video_id:
                     st.error("올바른 YouTube URL이 아닙니다.")
                 else:
-                    status_box = st.status(f"영상 ID: {video_id} 분석 중...", expanded=True)
-                    single_yt_data = []
-                    try:
-                        youtube = build('youtube', 'v3', developerKey=yt_api_key)
-                        
-                        # 영상 정보 확인
-                        video_response = youtube.videos().list(part='snippet,statistics', id=video_id).execute()
-                        if not video_response.get('items'):
-                            status_box.update(label="영상을 찾을 수 없습니다.", state="error")
-                        else:
-                            v_info = video_response['items'][0]
-                            v_title = v_info['snippet']['title']
-                            status_box.write(f"📺 분석 대상: {v_title}")
-
-                            # 댓글 수집
-                            comments_collected = 0
-                            next_page_token = None
-                            
-                            while comments_collected < max_comments_single:
-                                request = youtube.commentThreads().list(
-                                    part="snippet", videoId=video_id, maxResults=100, 
-                                    textFormat="plainText", pageToken=next_page_token, order="relevance"
-                                )
-                                response = request.execute()
-                                
-                                for item in response.get('items', []):
-                                    c_snip = item['snippet']['topLevelComment']['snippet']
-                                    single_yt_data.append({
-                                        '영상제목': v_title, '작성자': c_snip['authorDisplayName'],
-                                        '댓글내용': c_snip['textDisplay'], '좋아요': c_snip['likeCount'],
-                                        '작성일': c_snip['publishedAt'][:10]
-                                    })
-                                    comments_collected += 1
-                                
-                                next_page_token = response.get('nextPageToken')
-                                if not next_page_token or comments_collected >= max_comments_single: break
-                            
-                            status_box.update(label="수집 완료!", state="complete")
-                            
-                            if single_yt_data:
-                                df_single = pd.DataFrame(single_yt_data)
-                                st.session_state['yt_single_data'] = df_single # 저장
-                            else:
-                                st.warning("댓글이 없거나 차단된 영상입니다.")
-                    except Exception as e:
-                        status_box.update(label="에러 발생", state="error")
-                        st.error(f"오류: {e}")
+                    start_job('yt_single', ('yt_single', api_key_fingerprint(yt_api_key), video_id, max_comments_single, include_replies),
+                              f"YouTube 영상 {video_id}",
+                              partial(run_yt_single_job, api_key=yt_api_key, video_id=video_id,
+                                      max_comments=max_comments_single, include_replies=include_replies))
+
+        # 댓글 수집 - 받은 묶음은 작업의 행 버퍼 하나에만 쌓이고, 표는 JOB_POLL_SECONDS마다 다시 그립니다.
+        job, single_yt_data = take_finished_job('yt_single')
+        if job:
+            if single_yt_data:
+                with metrics.span('dataframe.build'):
+                    df_single = pd.DataFrame.from_records(single_yt_data, columns=YT_SINGLE_COLUMNS)
+                store_dataset('yt_single_data', df_single) # 저장
+            elif job.state == DONE:
+                st.warning("댓글이 없거나 차단된 영상입니다.")
+        elif slot_job('yt_single'):
+            job_progress('yt_single', columns=YT_SINGLE_COLUMNS)
 
         # 💡 [화면 표시] YouTube Single
         if 'yt_single_data' in st.session_state and st.session_state['yt_single_data'] is not None:
             df_single = st.session_state['yt_single_data']
-            st.success(f"총 {len(df_single)}개의 댓글을 수집했습니다.")
+            reply_count = int((df_single['구분'] == '답글').sum()) if '구분' in df_single else 0
+            st.success(f"총 {len(df_single)}개의 댓글을 수집했습니다. (답글 {reply_count}개 포함)")
             st.dataframe(df_single)
-            st.download_button("결과 다운로드", df_single.to_csv(index=False).encode('utf-8-sig'), f"yt_single.csv")
-            visualize_data(df_single, "댓글내용")
+            dataset_caption('yt_single_data')
+            export_buttons(df_single, "yt_single", "yt_single", "결과 다운로드")
+            visualize_data(df_single, "댓글내용", "yt_single")
 
 # =========================================================
 # [SECTION 3] 4chan (포챈) - 시각화 제외
 # =========================================================
 elif menu == "4chan (해외 포럼)": 
-    st.subheader("🍀 4chan (/v/ - Video Games) 실시간 반응")
+    st.subheader("🍀 4chan 게임 게시판 실시간 반응")
     col1, col2 = st.columns([3, 1])
     with col1:
-        search_keyword = st.text_input("검색어 (영어, 예: Elden Ring)", value="Elden Ring")
+        search_text = st.text_area("검색어 (영어, 한 줄에 하나 · 별칭은 쉼표로 구분)", value="Elden Ring, Nightreign")
     with col2:
-        result_limit = st.number_input("가져올 스레드 수", min_value=1, max_value=20, value=3)
+        boards = st.multiselect("게시판", FOURCHAN_BOARDS, default=['v'])
+        result_limit = st.number_input("검색어별 스레드 수", min_value=1, max_value=20, value=3)
 
     if st.button("4chan 데이터 수집 시작", key="btn_4chan"):
-        status_box = st.status("4chan 스캔 중...", expanded=True)
-        fourchan_data = []
-        try:
-            catalog_url = "https://a.4cdn.org/v/catalog.json"
-            res = requests.get(catalog_url, verify=False)
-            if res.status_code == 200:
-                pages = res.json()
-                found_threads = []
-                for page in pages:
-                    for thread in page.get('threads', []):
-                        title = thread.get('sub', '') 
-                        comment = thread.get('com', '')
-                        if search_keyword.lower() in title.lower() or search_keyword.lower() in comment.lower():
-                            found_threads.append(thread['no'])
-                            if len(found_threads) >= result_limit: break
-                    if len(found_threads) >= result_limit: break
-                
-                if found_threads:
-                    status_box.write(f"✅ {len(found_threads)}개 스레드 발견. 상세 수집 중...")
-                    progress_bar = st.progress(0)
-                    for idx, thread_id in enumerate(found_threads):
-                        thread_url = f"https://a.4cdn.org/v/thread/{thread_id}.json"
-                        t_res = requests.get(thread_url, verify=False)
-                        if t_res.status_code == 200:
-                            posts = t_res.json().get('posts', [])
-                            op_post = posts[0]
-                            op_content = BeautifulSoup(op_post.get('com', ''), "html.parser").get_text()
-                            fourchan_data.append({
-                                '구분': '원글', '내용': op_content, '작성일': datetime.fromtimestamp(op_post['time']).strftime('%Y-%m-%d %H:%M')
-                            })
-                            for reply in posts[1:]:
-                                reply_content = BeautifulSoup(reply.get('com', ''), "html.parser").get_text()
-                                fourchan_data.append({
-                                    '구분': '댓글', '내용': reply_content, '작성일': datetime.fromtimestamp(reply['time']).strftime('%Y-%m-%d %H:%M')
-                                })
-                        time.sleep(0.5)
-                        progress_bar.progress((idx + 1) / len(found_threads))
-                    
-                    status_box.update(label="완료!", state="complete")
-                    if fourchan_data:
-                        df_4chan = pd.DataFrame(fourchan_data)
-                        st.dataframe(df_4chan)
-                        st.download_button("엑셀 다운로드", df_4chan.to_csv(index=False).encode('utf-8-sig'), f"4chan_{search_keyword}.csv")
-                else: status_box.update(label="검색 결과 없음", state="error")
-            else: st.error("접속 실패")
-        except Exception as e: st.error(f"오류: {e}")
+        targets = parse_search_targets(search_text)
+        if not targets or not boards:
+            st.error("검색어와 게시판을 입력하세요.")
+        else:
+            # 별칭까지 키에 넣어야 이름만 같은 다른 검색에 합류하지 않습니다.
+            key = ('4chan', tuple((k, tuple(v)) for k, v in targets.items()), tuple(boards), result_limit)
+            start_job('4chan', key, f"4chan {', '.join(targets)}",
+                      partial(run_4chan_job, targets=targets, boards=boards, limit=result_limit))
+
+    job, fourchan_data = take_finished_job('4chan')
+    if job:
+        if fourchan_data:
+            with metrics.span('dataframe.build'):
+                df_4chan = pd.DataFrame(fourchan_data)
+            store_dataset('fourchan_data', df_4chan)
+        elif job.state == DONE: st.error("검색 결과 없음")
+    elif slot_job('4chan'):
+        job_progress('4chan')
+
+    if st.session_state.get('fourchan_data') is not None:
+        df_4chan = st.session_state['fourchan_data']
+        st.dataframe(df_4chan)
+        dataset_caption('fourchan_data')
+        export_buttons(df_4chan, f"4chan_{'_'.join(df_4chan['검색어'].unique())}", "4chan", "엑셀 다운로드")
 
 # =========================================================
 # [SECTION 4] 디시인사이드 - 시각화 제외
@@ -543,54 +789,37 @@ elif menu == "디시인사이드":
     with col2:
         keyword = st.text_input("검색어", value="")
         pages_to_crawl = st.number_input("페이지 수", value=1)
+    fetch_posts = st.checkbox("본문/댓글 수까지 수집", value=False)
+    max_rate = st.number_input("최대 초당 요청 수", min_value=0.5, max_value=10.0, value=DC_MAX_RATE, step=0.5,
+                               help="응답이 정상이면 이 값까지 천천히 올리고, 403/429/느린 응답에는 절반으로 줄입니다.")
 
     if st.button("디시인사이드 수집 시작", key="btn_dc"):
-        status_box = st.status("접속 중...", expanded=True)
-        dc_data = []
-        base_url = "https://gall.dcinside.com/mgallery/board/lists/" if is_minor else "https://gall.dcinside.com/board/lists/"
-        target_referer = f"{base_url}?id={gallery_id}"
-        
-        # 모바일 위장 헤더 사용 (차단 우회용)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Referer': target_referer,
-            'Connection': 'keep-alive'
-        }
-
-        try:
-            progress_bar = st.progress(0)
-            for i in range(pages_to_crawl):
-                params = {'id': gallery_id, 'page': i+1}
-                if keyword:
-                    params['s_type'] = 'search_subject_memo'
-                    params['s_keyword'] = keyword
-                
-                # 랜덤 딜레이 (봇 탐지 우회)
-                wait_time = random.uniform(2, 4)
-                status_box.write(f"⏳ {i+1}페이지 수집 전 {wait_time:.1f}초 대기...")
-                time.sleep(wait_time)
-                
-                res = requests.get(base_url, headers=headers, params=params)
-                if res.status_code == 200:
-                    soup = BeautifulSoup(res.text, 'html.parser')
-                    rows = soup.find_all('tr', class_='ub-content')
-                    for row in rows:
-                        try:
-                            if 'ub-notice' in row.get('class', []): continue
-                            title_tag = row.find('td', class_='gall_tit').find('a')
-                            title = title_tag.text.strip()
-                            dc_data.append({'갤러리ID': gallery_id, '제목': title})
-                        except: continue
-                    progress_bar.progress((i + 1) / pages_to_crawl)
-                else:
-                    st.error(f"접속 실패 Code: {res.status_code}")
-                    break
-            
-            status_box.update(label="완료!", state="complete")
-            if dc_data:
+        start_job('dc', ('dc', gallery_id, is_minor, keyword, pages_to_crawl, fetch_posts, max_rate), f"디시인사이드 {gallery_id}",
+                  partial(run_dc_job, gallery_id=gallery_id, is_minor=is_minor, keyword=keyword, pages=pages_to_crawl,
+                          fetch_posts=fetch_posts, max_rate=max_rate))
+
+    job, dc_data = take_finished_job('dc')
+    if job:
+        if dc_data:
+            with metrics.span('dataframe.build'):
                 df_dc = pd.DataFrame(dc_data)
-                st.dataframe(df_dc)
-                st.download_button("엑셀 다운로드", df_dc.to_csv(index=False).encode('utf-8-sig'), f"dc_{gallery_id}.csv")
-            else: st.warning("데이터 없음")
-        except Exception as e: st.error(f"오류: {e}")
\ No newline at end of file
+            store_dataset('dc_data', df_dc)
+        elif job.state == DONE: st.warning("데이터 없음")
+    elif slot_job('dc'):
+        job_progress('dc')
+
+    if st.session_state.get('dc_data') is not None:
+        df_dc = st.session_state['dc_data']
+        st.dataframe(df_dc)
+        dataset_caption('dc_data')
+        export_buttons(df_dc, f"dc_{df_dc['갤러리ID'].iloc[0]}", "dc", "엑셀 다운로드")
+# --- 사이드바: 세션 데이터셋 메모리 + 진단 (이번 실행에서 저장한 결과까지 반영되도록 맨 끝에서 그림) ---
+with st.sidebar:
+    dataset_sizes = st.session_state.get('_dataset_sizes')
+    if dataset_sizes:
+        total = sum(size for size, _ in dataset_sizes.values())
+        st.caption(f"💾 세션 데이터 {format_bytes(total)} / 예산 {format_bytes(SESSION_MEMORY_BUDGET)}")
+        for name, (size, before) in dataset_sizes.items():
+            st.caption(f"· {name}: {format_bytes(size)} (압축 전 {format_bytes(before)})")
+    with st.expander("🩺 진단 (마지막 실행)"):
+        render_diagnostics()
@@ -0,0 +1,244 @@
+"""
+일괄 수집기 (명령줄, Streamlit 없이 실행)
+작업 파일(JSON)에 적힌 대상들을 수집기별 동시 실행 한도 안에서 병렬로 돌리고, 결과를 Parquet으로 바로 씁니다.
+수집기(소스)마다 프로세스 하나를 쓰고, 그 안에서 limits 개수만큼 스레드로 대상을 나눠 돌립니다.
+(호스트별 속도 제한 버킷이 프로세스 안에서만 공유되므로, 한 소스를 여러 프로세스로 쪼개지 않습니다.)
+
+사용법: python batch.py jobs.json [--out batch_output] [--processes 5]
+
+작업 파일 형식 (jobs.example.json 참고):
+{
+  "limits":   {"steam_reviews": 4, "steam_discussions": 2, "youtube": 2, "4chan": 1, "dcinside": 1},
+  "defaults": {"steam_reviews": {"language": "all", "days": 30}},
+  "jobs": [
+    {"source": "steam_reviews", "app_id": "1562700"},
+    {"source": "youtube", "keyword": "Elden Ring", "max_videos": 10}
+  ]
+}
+날짜는 "start_date"/"end_date"(YYYY-MM-DD) 또는 오늘 기준 "days"로 지정합니다.
+YouTube API 키는 작업의 "api_key" 또는 환경 변수 YOUTUBE_API_KEY에서 읽습니다.
+결과는 <out>/<source>/<작업 이름>.parquet에 씁니다. 이름은 "name" 또는 대상·언어·기간으로 만들고, 겹치면 시작 전에 오류를 냅니다.
+스팀 리뷰는 수집 직후 새 리뷰를 일별 키워드 색인(trends.py)에 더합니다. ("keyword_index": false로 끔)
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from collectors import (
+    get_rate_limiter, get_adaptive_limiter, sync_reviews, sync_reviews_by_language, load_reviews,
+    crawl_discussions, QuotaMeter, get_youtube_service, yt_execute, search_keyword_videos,
+    collect_keyword_comments, extract_video_id, stream_video_comments, YT_SINGLE_COLUMNS,
+    parse_search_targets, collect_4chan, DC_MIN_RATE, DC_MAX_RATE, crawl_dc_gallery,
+)
+from trends import update_keyword_index
+
+DEFAULT_LIMITS = {'steam_reviews': 4, 'steam_discussions': 2, 'youtube': 2, '4chan': 1, 'dcinside': 1}
+DEFAULT_DAYS = 30
+
+
+def _date_range(job):
+    end = date.fromisoformat(job['end_date']) if job.get('end_date') else date.today()
+    if job.get('start_date'):
+        return date.fromisoformat(job['start_date']), end
+    return end - timedelta(days=int(job.get('days', DEFAULT_DAYS))), end
+
+
+# --- 소스별 실행기: 작업 dict → DataFrame ---
+def run_steam_reviews(job):
+    app_id, language = str(job['app_id']), job.get('language', 'all')
+    start_date, end_date = _date_range(job)
+    if language == 'all' and job.get('parallel_languages', True):
+        sync_reviews_by_language(app_id, start_date)
+    else:
+        sync_reviews(app_id, language, start_date)
+    if job.get('keyword_index', True):
+        update_keyword_index(app_id)
+    return load_reviews(app_id, language, start_date, end_date)
+
+
+def run_steam_discussions(job):
+    url = job.get('url') or f"https://steamcommunity.com/app/{job['app_id']}/discussions/"
+    limiter = get_rate_limiter(urlparse(url).netloc, float(job.get('requests_per_sec', 3.0)))
+    rows, failed = crawl_discussions(url, int(job.get('pages', 2)), limiter)
+    if failed:
+        print(f"  ⚠️ {url}: 토론글 {failed}개 실패", file=sys.stderr)
+    return pd.DataFrame(rows)
+
+
+def run_youtube(job):
+    api_key = job.get('api_key') or os.environ.get('YOUTUBE_API_KEY')
+    if not api_key:
+        raise ValueError("YouTube API 키가 없습니다. (작업의 api_key 또는 YOUTUBE_API_KEY)")
+    youtube = get_youtube_service(api_key)
+    quota = QuotaMeter()
+    try:
+        if job.get('url'):
+            video_id = extract_video_id(job['url'])
+            if not video_id:
+                raise ValueError(f"올바른 YouTube URL이 아닙니다: {job['url']}")
+            items = yt_execute(youtube, 'videos', quota, part='snippet', id=video_id).get('items', [])
+            if not items:
+                return pd.DataFrame(columns=YT_SINGLE_COLUMNS)
+            rows = []
+            stream_video_comments(youtube, video_id, items[0]['snippet']['title'], int(job.get('max_comments', 1000)),
+                                  quota, rows.extend, job.get('include_replies', True))
+            return pd.DataFrame.from_records(rows, columns=YT_SINGLE_COLUMNS)
+
+        start_date, end_date = _date_range(job)
+        _, videos = search_keyword_videos(youtube, job['keyword'], start_date, end_date, int(job.get('max_videos', 10)),
+                                          int(job.get('min_view_count', 0)), quota)
+        return pd.DataFrame(collect_keyword_comments(youtube, videos, int(job.get('max_comments', 200)), quota))
+    finally:
+        print(f"  {job_name(job)}: {quota.summary()}", file=sys.stderr)
+
+
+def _target_lines(job):
+    """4chan 검색 대상: 목록 또는 줄바꿈으로 구분한 문자열 → 줄 목록"""
+    targets = job.get('targets', [])
+    return targets if isinstance(targets, list) else targets.splitlines()
+
+
+def run_4chan(job):
+    targets = parse_search_targets("\n".join(_target_lines(job)))
+    rows, _, _, failed = collect_4chan(targets, job.get('boards', ['v']), int(job.get('limit', 3)))
+    if failed:
+        print(f"  ⚠️ 4chan: 스레드 {failed}개 실패", file=sys.stderr)
+    return pd.DataFrame(rows)
+
+
+def run_dcinside(job):
+    limiter = get_adaptive_limiter("gall.dcinside.com", DC_MIN_RATE, float(job.get('max_rate', DC_MAX_RATE)))
+    rows, failed, list_error = crawl_dc_gallery(
+        job['gallery_id'], job.get('is_minor', True), job.get('keyword', ''), int(job.get('pages', 1)), limiter,
+        job.get('fetch_posts', False)
+    )
+    if list_error and not rows:
+        raise RuntimeError(list_error)
+    if failed or list_error:
+        print(f"  ⚠️ {job['gallery_id']}: 본문 실패 {failed}개 · 목록 오류 {list_error or '없음'}", file=sys.stderr)
+    return pd.DataFrame(rows)
+
+
+RUNNERS = {
+    'steam_reviews': run_steam_reviews,
+    'steam_discussions': run_steam_discussions,
+    'youtube': run_youtube,
+    '4chan': run_4chan,
+    'dcinside': run_dcinside,
+}
+
+
+def _period(job):
+    if job.get('start_date') or job.get('end_date'):
+        return f"{job.get('start_date', '')}~{job.get('end_date', 'today')}"
+    return f"{job.get('days', DEFAULT_DAYS)}d"
+
+
+def job_name(job):
+    """
+    출력 파일 이름 (작업의 "name"이 있으면 그대로)
+    대상에 더해 결과를 바꾸는 설정(스팀 리뷰 언어, 기간)을 넣어 같은 대상의 다른 작업이 서로 덮어쓰지 않게 합니다.
+    """
+    if job.get('name'):
+        return job['name']
+    target = (job.get('app_id') or job.get('keyword') or job.get('url') or job.get('gallery_id')
+              or "_".join(_target_lines(job)) or "job")
+    parts = [job['source'], target]
+    if job['source'] == 'steam_reviews':
+        parts += [job.get('language', 'all'), _period(job)]
+    elif job['source'] == 'youtube' and not job.get('url'):
+        parts.append(_period(job))
+    return re.sub(r"[^\w.~-]+", "_", "_".join(str(part) for part in parts)).strip("_")[:120]
+
+
+def run_job(job, out_dir):
+    """작업 하나를 실행하고 Parquet으로 씁니다. 예외는 요약에 담아 돌려주며 다른 작업을 멈추지 않습니다."""
+    name = job_name(job)
+    started = time.monotonic()
+    summary = {'name': name, 'source': job['source'], 'rows': 0, 'path': None, 'error': None}
+    try:
+        df = RUNNERS[job['source']](job)
+        path = os.path.join(out_dir, job['source'], f"{name}.parquet")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(path, index=False)
+        summary.update(rows=len(df), path=path)
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+    summary['seconds'] = round(time.monotonic() - started, 1)
+    return summary
+
+
+def run_source(source, jobs, limit, out_dir):
+    """한 소스의 작업들을 스레드 limit개로 돌립니다. (프로세스 풀 워커에서 실행)"""
+    with ThreadPoolExecutor(max_workers=limit) as pool:
+        return list(pool.map(lambda job: run_job(job, out_dir), jobs))
+
+
+def load_jobs(path):
+    with open(path, encoding='utf-8') as f:
+        spec = json.load(f)
+    limits = dict(DEFAULT_LIMITS, **spec.get('limits', {}))
+    defaults = spec.get('defaults', {})
+    by_source = defaultdict(list)
+    names = Counter()
+    for job in spec['jobs']:
+        if job.get('source') not in RUNNERS:
+            raise ValueError(f"알 수 없는 source: {job.get('source')} (가능: {', '.join(RUNNERS)})")
+        job = dict(defaults.get(job['source'], {}), **job)
+        by_source[job['source']].append(job)
+        names[(job['source'], job_name(job))] += 1
+    # 같은 이름이면 같은 Parquet 파일에 쓰게 되어 한쪽 결과가 조용히 사라집니다.
+    duplicates = [f"{source}/{name}" for (source, name), n in names.items() if n > 1]
+    if duplicates:
+        raise ValueError(f"출력 이름이 겹치는 작업이 있습니다: {', '.join(duplicates)} (작업에 \"name\"을 지정하세요)")
+    return by_source, limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job_file")
+    parser.add_argument("--out", default="batch_output", help="Parquet 출력 폴더")
+    parser.add_argument("--processes", type=int, default=len(RUNNERS), help="동시에 돌릴 소스(프로세스) 수, 1이면 현재 프로세스에서 실행")
+    args = parser.parse_args()
+
+    by_source, limits = load_jobs(args.job_file)
+    total = sum(len(jobs) for jobs in by_source.values())
+    print(f"작업 {total}개 · 소스 {len(by_source)}개 → {args.out}")
+    started = time.monotonic()
+
+    summaries = []
+
+    def report(results):
+        for summary in results:
+            mark = "❌" if summary['error'] else "✅"
+            print(f"{mark} {summary['name']}: {summary['rows']}행 · {summary['seconds']}초 {summary['error'] or ''}")
+            summaries.append(summary)
+
+    if args.processes <= 1:
+        for source, jobs in by_source.items():
+            report(run_source(source, jobs, limits[source], args.out))
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.processes, len(by_source))) as pool:
+            futures = [pool.submit(run_source, source, jobs, limits[source], args.out) for source, jobs in by_source.items()]
+            for fut in as_completed(futures):
+                report(fut.result())
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "batch_summary.json"), 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, ensure_ascii=False, indent=2)
+    failed = sum(1 for s in summaries if s['error'])
+    print(f"완료: {total - failed}/{total}개 성공 · {time.monotonic() - started:.0f}초")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
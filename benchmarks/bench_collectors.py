@@ -0,0 +1,295 @@
+"""
+수집기/분석 파이프라인 오프라인 벤치마크
+실제 사이트 대신 replay.py의 녹화 응답 재생기로 각 수집기를 돌려 요청/초, 행/초, 최대 메모리, 단계별 시간을 재고,
+visualize_data가 쓰는 키워드 분석(토큰화 / 빈도 집계 / 캐시 적중 / 워드 클라우드 렌더링)을 문서 수별로 잽니다.
+결과는 JSON으로 저장하며, --compare로 이전 결과와 비교해 느려진 항목을 표시합니다.
+
+사용법: python benchmarks/bench_collectors.py [--latency 0.05] [--error-rate 0.02] [--sizes 1000,10000,100000]
+                                              [--only steam_reviews,youtube_keyword] [--skip-analysis]
+                                              [--real-rates] [--output results.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import collectors  # noqa: E402
+import analysis  # noqa: E402
+from replay import ReplayRouter, ReplayAdapter, ReplayHttp  # noqa: E402
+
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REGRESSION_THRESHOLD = 0.10
+START_DATE = date(2000, 1, 1)
+
+KR_WORDS = "전투 음악 난이도 보스 그래픽 최적화 캐릭터 스토리 패치 버그 가격 할인 타격감 퀘스트 밸런스 서버 업데이트".split()
+KR_TAILS = ["이 좋아요", "은 별로예요", "가 최고입니다", "도 괜찮네요", "을 개선해야 합니다", "는 아쉬워요"]
+EN_WORDS = "combat music difficulty boss graphics optimization character story patch bug price sale quest balance server update".split()
+EN_TAILS = ["is great", "feels terrible", "needs work", "is awesome", "could be better", "is fine"]
+
+
+def install_replay(router):
+    """공용 HTTP 클라이언트와 YouTube 호출을 재생기로 돌립니다."""
+    adapter = ReplayAdapter(router)
+    collectors.http_client.session.mount('https://', adapter)
+    collectors.http_client.session.mount('http://', adapter)
+    collectors._thread_http = lambda: ReplayHttp(router)
+
+
+class Stages:
+    """단계별 경과 시간 기록기"""
+    def __init__(self):
+        self.times = {}
+
+    @contextmanager
+    def __call__(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - started
+
+
+def measure(name, func, router, trace_memory):
+    """func(stages) → 행 수. 전체 시간, 단계별 시간, 요청 수, 최대 메모리를 한 건의 결과로 묶습니다."""
+    stages = Stages()
+    replay_before, http_before = router.stats(), collectors.http_client.stats()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    error = None
+    rows = 0
+    try:
+        rows = func(stages)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    replay_after, http_after = router.stats(), collectors.http_client.stats()
+
+    n_requests = replay_after.get('requests', 0) - replay_before.get('requests', 0)
+    return {
+        'name': name,
+        'seconds': round(seconds, 4),
+        'stages': {stage: round(t, 4) for stage, t in stages.times.items()},
+        'rows': rows,
+        'rows_per_sec': round(rows / seconds, 1) if seconds else None,
+        'requests': n_requests,
+        'requests_per_sec': round(n_requests / seconds, 1) if seconds else None,
+        'retries': http_after['retries'] - http_before['retries'],
+        'injected_errors': replay_after.get('injected_errors', 0) - replay_before.get('injected_errors', 0),
+        'peak_mb': round(peak / 1024 / 1024, 2) if peak is not None else None,
+        'error': error,
+    }
+
+
+# --- 수집기 시나리오: stages를 받아 행 수를 돌려줍니다 ---
+def bench_steam_reviews(stages):
+    with stages('sync'):
+        collectors.sync_reviews_by_language('bench', START_DATE)
+    with stages('load'):
+        df = collectors.load_reviews('bench', 'all', START_DATE, date.today())
+    return len(df)
+
+
+def bench_steam_discussions(stages, rps):
+    url = "https://steamcommunity.com/app/1562700/discussions/"
+    with stages('crawl'):
+        rows, _ = collectors.crawl_discussions(url, 5, collectors.get_rate_limiter('steamcommunity.com', rps))
+    return len(rows)
+
+
+def bench_4chan(stages):
+    targets = collectors.parse_search_targets("Elden Ring, Nightreign\nMonster Hunter\nHollow Knight Silksong\nPath of Exile")
+    with stages('catalog_index'):
+        index = collectors.get_catalog_index(['v', 'vg', 'vr'])
+    with stages('lookup'):
+        found = index.lookup(targets, 5)
+    threads = list(dict.fromkeys(t for hits in found.values() for t in hits))
+    with stages('threads'):
+        rows_by_thread, _ = collectors.fetch_4chan_threads(threads)
+    # 새로 고침 간격을 없애 같은 스레드를 다시 물으면 모두 304로 돌아옵니다.
+    refresh, collectors.FOURCHAN_MIN_REFRESH = collectors.FOURCHAN_MIN_REFRESH, 0
+    try:
+        with stages('refresh_304'):
+            collectors.fetch_4chan_threads(threads)
+    finally:
+        collectors.FOURCHAN_MIN_REFRESH = refresh
+    return sum(len(rows) for rows in rows_by_thread.values())
+
+
+def bench_youtube_keyword(stages, comment_pages):
+    quota = collectors.QuotaMeter()
+    with stages('service'):
+        youtube = collectors.get_youtube_service('bench-key')
+    with stages('search'):
+        _, videos = collectors.search_keyword_videos(youtube, "bench", START_DATE, date.today(), 10, 0, quota)
+    with stages('comments'):
+        rows = collectors.collect_keyword_comments(youtube, videos, comment_pages * 100, quota)
+    return len(rows)
+
+
+def bench_youtube_single(stages, comment_pages):
+    quota = collectors.QuotaMeter()
+    youtube = collectors.get_youtube_service('bench-key')
+    rows = []
+    with stages('stream'):
+        collectors.stream_video_comments(youtube, 'vid-single', 'bench', comment_pages * 100, quota, rows.extend)
+    return len(rows)
+
+
+def bench_dcinside(stages, min_rate, max_rate):
+    limiter = collectors.AdaptiveRateLimiter(min_rate, min_rate, max_rate)
+    with stages('crawl'):
+        rows, _, _ = collectors.crawl_dc_gallery('bench', True, '', 3, limiter, fetch_posts=True)
+    return len(rows)
+
+
+# --- 분석 시나리오 ---
+def synthetic_docs(n, lang, seed=0):
+    rng = random.Random(seed)
+    words, tails = (KR_WORDS, KR_TAILS) if lang == analysis.LANG_KR else (EN_WORDS, EN_TAILS)
+    return [" ".join(f"{rng.choice(words)}{'' if lang == analysis.LANG_KR else ' '}{rng.choice(tails)}"
+                     for _ in range(rng.randint(1, 6))) for _ in range(n)]
+
+
+def bench_analysis(stages, n, lang, font_path):
+    df = pd.DataFrame({'내용': synthetic_docs(n, lang, seed=n)})
+    if lang == analysis.LANG_KR:
+        with stages('kiwi_load'):  # 첫 호출에만 모델 로딩 시간이 잡힙니다.
+            analysis.get_kiwi()
+    texts = df['내용'].dropna().astype(str)
+    # 토큰화와 집계를 따로 잽니다. (한국어 토큰 목록은 여기서만 전부 모아 둡니다: 앱은 배치마다 바로 셈)
+    if lang == analysis.LANG_KR:
+        with stages('tokenize'):
+            tokens = list(analysis.tokenize_korean(texts.tolist()))
+        with stages('count'):
+            freq = analysis.frequency_series(analysis.count_korean_nouns(tokens))
+    else:
+        with stages('tokenize'):
+            chunks = analysis.split_english_chunks(texts)
+        with stages('count'):
+            freq = analysis.count_english_words(chunks)
+    analysis.get_keyword_cache().put(analysis.keyword_cache_key(texts, lang), freq, int(freq.memory_usage(deep=True)))
+    with stages('cache_hit'):
+        analysis.keyword_frequencies(df, '내용', lang)
+    with stages('render'):
+        analysis.wordcloud_png(freq.head(analysis.WORDCLOUD_MAX_WORDS).to_dict(), font_path)
+    return n
+
+
+def environment():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': revision or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, previous_path):
+    """이전 결과와 항목별 전체 시간을 비교해 출력합니다. 반환값: 느려진 항목 수"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {r['name']: r for r in json.load(f)['results']}
+    regressions = 0
+    print(f"\n{'benchmark':<36}{'before (s)':>12}{'after (s)':>12}{'change':>10}")
+    for result in results:
+        old = previous.get(result['name'])
+        if not old or not old['seconds'] or result['error']:
+            continue
+        change = result['seconds'] / old['seconds'] - 1
+        flag = " ⚠️" if change > REGRESSION_THRESHOLD else ""
+        regressions += bool(flag)
+        print(f"{result['name']:<36}{old['seconds']:>12.3f}{result['seconds']:>12.3f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.02, help="요청당 평균 지연(초), ±50%% 지터")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/503을 돌려줄 확률")
+    parser.add_argument("--review-pages", type=int, default=3, help="스팀 리뷰 언어별 페이지 수")
+    parser.add_argument("--comment-pages", type=int, default=3, help="YouTube 영상당 댓글 페이지 수")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="분석 벤치마크 문서 수 (쉼표 구분)")
+    parser.add_argument("--only", default="", help="실행할 벤치마크 이름 접두어 (쉼표 구분)")
+    parser.add_argument("--skip-analysis", action="store_true")
+    parser.add_argument("--real-rates", action="store_true", help="수집기의 실제 호스트별 속도 제한을 그대로 적용")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 끄기 (최대 메모리 생략, 시간 측정 부담 감소)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    collectors.REVIEW_DB_PATH = os.path.join(workdir, "reviews.db")
+    collectors.YT_CACHE_PATH = os.path.join(workdir, "youtube_cache.db")
+    collectors.http_client.backoff_base = 0.05
+    if not args.real_rates:
+        collectors.REVIEW_REQUESTS_PER_SEC = 10_000
+        collectors.FOURCHAN_REQUESTS_PER_SEC = 10_000
+    discussion_rps = 3.0 if args.real_rates else 10_000
+    dc_rates = (collectors.DC_MIN_RATE, collectors.DC_MAX_RATE) if args.real_rates else (10_000, 10_000)
+
+    router = ReplayRouter(latency=args.latency, error_rate=args.error_rate, review_pages=args.review_pages,
+                          review_languages=collectors.STEAM_LANGUAGES, yt_comment_pages=args.comment_pages)
+    install_replay(router)
+
+    scenarios = [
+        ('collector/steam_reviews', bench_steam_reviews),
+        ('collector/steam_discussions', lambda s: bench_steam_discussions(s, discussion_rps)),
+        ('collector/4chan', bench_4chan),
+        ('collector/youtube_keyword', lambda s: bench_youtube_keyword(s, args.comment_pages)),
+        ('collector/youtube_single', lambda s: bench_youtube_single(s, args.comment_pages)),
+        ('collector/dcinside', lambda s: bench_dcinside(s, *dc_rates)),
+    ]
+    if not args.skip_analysis:
+        font_path = analysis.resolve_font_path()
+        for n in (int(size) for size in args.sizes.split(",") if size):
+            for lang, tag in ((analysis.LANG_KR, 'kr'), (analysis.LANG_EN, 'en')):
+                scenarios.append((f"analysis/{tag}/{n}", lambda s, n=n, lang=lang: bench_analysis(s, n, lang, font_path)))
+    if args.only:
+        prefixes = [p.strip() for p in args.only.split(",")]
+        scenarios = [(name, func) for name, func in scenarios if any(p in name for p in prefixes)]
+
+    print(f"{'benchmark':<36}{'seconds':>10}{'rows/s':>12}{'req/s':>10}{'peak MB':>10}  stages")
+    results = []
+    for name, func in scenarios:
+        result = measure(name, func, router, not args.no_memory)
+        results.append(result)
+        stage_text = " · ".join(f"{stage} {t:.3f}s" for stage, t in result['stages'].items())
+        peak = f"{result['peak_mb']:.1f}" if result['peak_mb'] is not None else "-"
+        print(f"{name:<36}{result['seconds']:>10.3f}{result['rows_per_sec'] or 0:>12,.0f}"
+              f"{result['requests_per_sec'] or 0:>10,.0f}{peak:>10}  {stage_text}"
+              + (f"  ❌ {result['error']}" if result['error'] else ""))
+
+    output = args.output or os.path.join(RESULT_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'config': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
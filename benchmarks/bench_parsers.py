@@ -0,0 +1,99 @@
+"""
+HTML 파싱 마이크로 벤치마크
+benchmarks/fixtures/ 의 저장된 페이지로 기존 BeautifulSoup('html.parser') 코드와
+parsers.py(lxml + 컴파일된 XPath)의 페이지당 파싱 시간을 비교하고, 두 결과가 같은지도 확인합니다.
+
+사용법: python benchmarks/bench_parsers.py [--repeat 50]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from parsers import parse_discussion_topics, parse_discussion_thread, parse_dc_list, parse_dc_post  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+# --- 기존 app.py 구현 (비교 기준) ---
+def bs4_discussion_topics(text):
+    soup = BeautifulSoup(text, 'html.parser')
+    topics = []
+    for row in soup.find_all('div', class_='forum_topic'):
+        link_tag = row.find('a', class_='forum_topic_overlay')
+        title_tag = row.find('div', class_='forum_topic_name')
+        if not link_tag: continue
+        topics.append((link_tag['href'], title_tag.text.strip() if title_tag else "제목 없음"))
+    return topics
+
+
+def bs4_discussion_thread(text):
+    sub_soup = BeautifulSoup(text, 'html.parser')
+    op = None
+    op_div = sub_soup.find('div', class_='forum_op')
+    if op_div:
+        op = (op_div.find('a', class_='forum_op_author').text.strip(), op_div.find('div', class_='content').text.strip())
+    comments = []
+    for comm in sub_soup.find_all('div', class_='commentthread_comment'):
+        c_text = comm.find('div', class_='commentthread_comment_text').text.strip()
+        c_author = comm.find('a', class_='commentthread_author_link').text.strip()
+        if c_text:
+            comments.append((c_author, c_text))
+    return op, comments
+
+
+def bs4_dc_list(text):
+    soup = BeautifulSoup(text, 'html.parser')
+    posts = []
+    for row in soup.find_all('tr', class_='ub-content'):
+        if 'ub-notice' in row.get('class', []): continue
+        posts.append({'no': row.get('data-no'), 'title': row.find('td', class_='gall_tit').find('a').text.strip()})
+    return posts
+
+
+def bs4_dc_post(text):
+    soup = BeautifulSoup(text, 'html.parser')
+    body = soup.find('div', class_='write_div')
+    count_tag = soup.find('span', class_='gall_comment')
+    count = re.search(r"\d+", count_tag.text) if count_tag else None
+    return {'body': body.text.strip() if body else "", 'comments': int(count.group()) if count else None}
+
+
+CASES = [
+    ("steam_discussion_list.html", bs4_discussion_topics, parse_discussion_topics),
+    ("steam_discussion_topic.html", bs4_discussion_thread, parse_discussion_thread),
+    ("dcinside_list.html", bs4_dc_list, parse_dc_list),
+    ("dcinside_post.html", bs4_dc_post, parse_dc_post),
+]
+
+
+def per_page_ms(func, text, repeat):
+    func(text)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'fixture':<30}{'bs4 (ms)':>12}{'lxml (ms)':>12}{'speedup':>10}")
+    for name, baseline, fast in CASES:
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            text = f.read()
+        if baseline(text) != fast(text):
+            sys.exit(f"{name}: 파서 결과가 기존 구현과 다릅니다.")
+        old_ms = per_page_ms(baseline, text, args.repeat)
+        new_ms = per_page_ms(fast, text, args.repeat)
+        print(f"{name:<30}{old_ms:>12.2f}{new_ms:>12.2f}{old_ms / new_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
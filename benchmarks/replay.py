@@ -0,0 +1,184 @@
+"""
+녹화 응답 재생 전송 계층 (오프라인 벤치마크용)
+benchmarks/fixtures/ 의 저장된 응답을 Steam/YouTube/4chan/디시인사이드 대신 돌려줍니다.
+requests 세션에는 전송 어댑터(ReplayAdapter)로, googleapiclient에는 httplib2 호환 객체(ReplayHttp)로 끼워 넣고,
+요청마다 지연(latency ± jitter)과 오류(error_rate 확률로 429/503)를 주입할 수 있습니다.
+응답 본문은 생성 시점에 미리 직렬화해 두므로 재생 자체의 비용은 측정값에 거의 섞이지 않습니다.
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+
+import httplib2
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_THREAD_JSON_RE = re.compile(r"/thread/(\d+)\.json$")
+_YT_ENDPOINT_RE = re.compile(r"/youtube/v3/(\w+)$")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class ReplayRouter:
+    """
+    URL → (상태 코드, 헤더, 본문) 재생기 (스레드 안전)
+    review_pages: 스팀 리뷰 언어별 페이지 수 (페이지당 100개, 그 뒤는 빈 페이지)
+    yt_comment_pages: 영상당 commentThreads 페이지 수
+    """
+    def __init__(self, latency=0.0, jitter=0.5, error_rate=0.0, review_pages=5, review_languages=(),
+                 yt_comment_pages=3, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.review_pages = review_pages
+        self.yt_comment_pages = yt_comment_pages
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+
+        self.discussion_list = _fixture("steam_discussion_list.html").encode('utf-8')
+        self.discussion_topic = _fixture("steam_discussion_topic.html").encode('utf-8')
+        self.dc_list = _fixture("dcinside_list.html").encode('utf-8')
+        self.dc_post = _fixture("dcinside_post.html").encode('utf-8')
+        self.catalog = _fixture("fourchan_catalog.json").encode('utf-8')
+        self.thread = json.loads(_fixture("fourchan_thread.json"))
+        self.yt = {name: json.loads(_fixture(f"youtube_{name}.json"))
+                   for name in ('search', 'videos', 'commentThreads', 'comments')}
+        self.yt_bodies = {name: json.dumps(data).encode('utf-8') for name, data in self.yt.items()}
+        self.yt_thread_pages = {}
+        for page in range(self.yt_comment_pages):
+            data = dict(self.yt['commentThreads'])
+            data.pop('nextPageToken', None)
+            if page + 1 < self.yt_comment_pages:
+                data['nextPageToken'] = f"p{page + 1}"
+            self.yt_thread_pages[page] = json.dumps(data).encode('utf-8')
+
+        template = json.loads(_fixture("steam_appreviews.json"))
+        self.review_bodies = {}
+        for lang_idx, lang in enumerate(('all',) + tuple(review_languages)):
+            for page in range(review_pages + 1):
+                self.review_bodies[(lang, page)] = self._review_page(template, lang_idx, lang, page)
+
+    def _review_page(self, template, lang_idx, lang, page):
+        data = dict(template, cursor=f"p{page + 1}")
+        if page >= self.review_pages:
+            data['reviews'] = []
+        else:
+            base_ts = template['reviews'][0]['timestamp_created']
+            data['reviews'] = [
+                dict(review, recommendationid=f"{lang_idx:02d}{page:04d}{i:03d}",
+                     language=review['language'] if lang == 'all' else lang,
+                     timestamp_created=base_ts - (page * len(template['reviews']) + i) * 600)
+                for i, review in enumerate(template['reviews'])
+            ]
+        data['query_summary'] = dict(template['query_summary'], total_reviews=self.review_pages * len(template['reviews']))
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def _wait(self):
+        if self.latency <= 0:
+            return
+        with self.lock:
+            factor = 1 + self.jitter * self.rng.uniform(-1, 1)
+        time.sleep(self.latency * factor)
+
+    def handle(self, url, headers=None):
+        headers = headers or {}
+        self._count('requests')
+        self._wait()
+        with self.lock:
+            inject = self.error_rate and self.rng.random() < self.error_rate
+            status = self.rng.choice((429, 503)) if inject else None
+        if inject:
+            self._count('injected_errors')
+            return status, ({'Retry-After': '0'} if status == 429 else {}), b""
+
+        parsed = urlparse(url)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        host, path = parsed.netloc, parsed.path
+
+        if host == 'store.steampowered.com' and path.startswith('/appreviews/'):
+            cursor = query.get('cursor', '*')
+            page = 0 if cursor == '*' else int(cursor.lstrip('p'))
+            body = self.review_bodies.get((query.get('language', 'all'), min(page, self.review_pages)))
+            return (200, {'Content-Type': 'application/json'}, body) if body else (404, {}, b"")
+        if host == 'steamcommunity.com':
+            body = self.discussion_topic if '/discussions/0/' in path else self.discussion_list
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, body
+        if host == 'a.4cdn.org':
+            etag = f'"{path}"'
+            if headers.get('If-None-Match') == etag:
+                self._count('not_modified')
+                return 304, {'ETag': etag}, b""
+            match = _THREAD_JSON_RE.search(path)
+            if path.endswith('/catalog.json'):
+                body = self.catalog
+            elif match:
+                no = int(match.group(1))
+                body = json.dumps({'posts': [dict(post, no=no + i, resto=0 if i == 0 else no)
+                                             for i, post in enumerate(self.thread['posts'])]}).encode('utf-8')
+            else:
+                return 404, {}, b""
+            return 200, {'Content-Type': 'application/json', 'ETag': etag}, body
+        if host == 'gall.dcinside.com':
+            body = self.dc_post if '/view/' in path else self.dc_list
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, body
+        match = _YT_ENDPOINT_RE.search(path)
+        if host.endswith('googleapis.com') and match:
+            endpoint = match.group(1)
+            if endpoint == 'commentThreads':
+                page = int(query.get('pageToken', 'p0').lstrip('p'))
+                return 200, {'Content-Type': 'application/json'}, self.yt_thread_pages[min(page, self.yt_comment_pages - 1)]
+            if endpoint in self.yt_bodies:
+                return 200, {'Content-Type': 'application/json'}, self.yt_bodies[endpoint]
+        return 404, {}, b""
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests 세션에 mount 하는 재생 어댑터"""
+    def __init__(self, router):
+        super().__init__()
+        self.router = router
+
+    def send(self, request, **kwargs):
+        status, headers, body = self.router.handle(request.url, request.headers)
+        res = requests.Response()
+        res.status_code = status
+        res.headers = CaseInsensitiveDict(headers)
+        res._content = body
+        res.encoding = 'utf-8'
+        res.url = request.url
+        res.request = request
+        res.reason = "OK" if status < 400 else "Replay"
+        return res
+
+    def close(self):
+        pass
+
+
+class ReplayHttp:
+    """googleapiclient가 쓰는 httplib2.Http 대용 (request()만 구현)"""
+    def __init__(self, router):
+        self.router = router
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        status, res_headers, content = self.router.handle(uri, headers)
+        return httplib2.Response(dict(res_headers, status=str(status))), content
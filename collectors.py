@@ -0,0 +1,1321 @@
+"""
+수집기 모음 (Streamlit 의존성 없음)
+스팀 리뷰/토론장, YouTube, 4chan, 디시인사이드 수집 함수와 공용 HTTP 클라이언트, 속도 제한, 로컬 저장소를 담습니다.
+app.py(화면)와 batch.py(명령줄 일괄 수집)가 같은 함수를 그대로 import 해서 씁니다.
+진행 상황은 on_progress 같은 콜백으로만 알리고, 화면 출력은 호출하는 쪽이 맡습니다.
+"""
+import contextvars
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta, timezone, time as dt_time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from requests.adapters import HTTPAdapter
+
+from instrumentation import metrics, submit_in_context
+from parsers import parse_discussion_topics, parse_discussion_thread, parse_dc_list, parse_dc_post
+
+# SSL 경고 메시지 숨기기 (스팀 토론장은 verify=False로 요청)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# --- ⏱️ 호스트별 요청 속도 제한 (토큰 버킷) ---
+class TokenBucket:
+    """
+    초당 rate개씩 토큰이 채워지는 토큰 버킷 (스레드 안전)
+    acquire()는 토큰이 생길 때까지 대기한 뒤 1개를 소비합니다.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate, capacity=None):
+        with self.lock:
+            self.rate = float(rate)
+            self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def observe(self, status, elapsed):
+        """요청 결과 알림 (상태 코드, 연결 오류면 None). 고정 속도 버킷은 무시합니다."""
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    AIMD 방식으로 속도를 스스로 맞추는 토큰 버킷
+    정상 응답이 이어지면 초당 약 increase씩 속도를 올리고(가산 증가),
+    403/429/5xx/연결 오류/slow_after초 넘는 응답에는 decrease배로 줄입니다(승산 감소).
+    감소 후 cooldown초 동안은 증가도, 추가 감소도 하지 않아 동시에 나간 요청들의 실패가 한 번만 반영됩니다.
+    """
+    def __init__(self, rate, min_rate, max_rate, increase=0.2, decrease=0.5, slow_after=3.0, cooldown=3.0):
+        super().__init__(rate, capacity=1)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_after = slow_after
+        self.cooldown = cooldown
+        self.hold_until = 0.0
+        self.backoffs = 0
+
+    def set_bounds(self, min_rate, max_rate):
+        with self.lock:
+            self.min_rate, self.max_rate = float(min_rate), float(max_rate)
+            self.rate = min(max(self.rate, self.min_rate), self.max_rate)
+
+    def observe(self, status, elapsed):
+        blocked = status is None or status in (403, 429) or status >= 500 or elapsed >= self.slow_after
+        with self.lock:
+            now = time.monotonic()
+            if now < self.hold_until:
+                return
+            if blocked:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.hold_until = now + self.cooldown
+                self.backoffs += 1
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+
+@lru_cache(maxsize=None)
+def _rate_limiter_registry():
+    # 버킷은 프로세스 단위로 공유합니다. (Streamlit 재실행과 배치 워커 스레드 모두 같은 객체를 씀)
+    return {}, threading.Lock()
+
+
+def get_rate_limiter(host, rate):
+    """호스트별 토큰 버킷을 가져오고, 요청한 속도(초당 요청 수)로 맞춥니다."""
+    registry, lock = _rate_limiter_registry()
+    with lock:
+        bucket = registry.get(host)
+        if bucket is None:
+            bucket = registry[host] = TokenBucket(rate)
+        elif bucket.rate != rate:
+            bucket.set_rate(rate)
+    return bucket
+
+
+def get_adaptive_limiter(host, min_rate, max_rate):
+    """호스트별 AIMD 버킷. 배운 속도는 다음 수집에도 이어지고, 처음에는 min_rate에서 시작합니다."""
+    registry, lock = _rate_limiter_registry()
+    with lock:
+        limiter = registry.get(host)
+        if not isinstance(limiter, AdaptiveRateLimiter):
+            limiter = registry[host] = AdaptiveRateLimiter(min_rate, min_rate, max_rate)
+    limiter.set_bounds(min_rate, max_rate)
+    return limiter
+
+
+# --- 🌐 공용 HTTP 클라이언트 (연결 재사용 + 재시도/백오프 + 통계) ---
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_POOL_SIZE = 16
+HTTP_TIMEOUT = 30
+HTTP_MAX_RETRIES = 4
+_retry_limit = contextvars.ContextVar('http_max_retries', default=None)
+
+
+class HttpClient:
+    """
+    모든 수집기가 함께 쓰는 HTTP 클라이언트 (스레드 안전)
+    - 호스트별 keep-alive 연결 풀 (requests.Session + HTTPAdapter)
+    - 429/5xx/연결 오류 시 지수 백오프 + 지터로 재시도, Retry-After 헤더 우선
+    - 요청/재시도/실패/바이트/지연시간 누적 카운터 (계측이 켜져 있으면 호스트/상태 코드별로도 기록)
+    재시도 횟수는 요청마다(max_retries=) 또는 작업 단위(with http_client.retry_limit(n))로 바꾸며, 공용 설정은 건드리지 않습니다.
+    """
+    def __init__(self, max_retries=HTTP_MAX_RETRIES, backoff_base=0.5, backoff_max=30.0, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'retries': 0, 'failures': 0, 'bytes': 0, 'latency': 0.0}
+
+    def _record(self, **deltas):
+        with self.lock:
+            for name, value in deltas.items():
+                self.counters[name] += value
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    @contextmanager
+    def retry_limit(self, max_retries):
+        """with 블록 안(과 submit_in_context로 넘긴 워커)의 요청만 재시도 횟수를 max_retries로 바꿉니다."""
+        token = _retry_limit.set(max_retries)
+        try:
+            yield
+        finally:
+            _retry_limit.reset(token)
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def _retry_after(self, res):
+        value = res.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.backoff_max * 4)
+
+    def get(self, url, limiter=None, retry_statuses=HTTP_RETRY_STATUSES, max_retries=None, **kwargs):
+        """
+        GET 요청. limiter(토큰 버킷)가 있으면 재시도를 포함한 매 시도마다 토큰을 받고, 결과를 observe()로 알립니다.
+        재시도 횟수를 다 쓰면 마지막 응답을 그대로 돌려주거나, 연결 오류를 다시 던집니다.
+        max_retries: 없으면 retry_limit()로 지정한 값, 그것도 없으면 self.max_retries
+        """
+        if max_retries is None:
+            max_retries = _retry_limit.get()
+        if max_retries is None:
+            max_retries = self.max_retries
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            if limiter:
+                with metrics.span('http.rate_wait'):
+                    limiter.acquire()
+            started = time.monotonic()
+            try:
+                res = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(requests=1, failures=1, latency=time.monotonic() - started)
+                metrics.record_http(url, None, 0, time.monotonic() - started)
+                if limiter: limiter.observe(None, time.monotonic() - started)
+                if attempt >= max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                elapsed = time.monotonic() - started
+                self._record(requests=1, bytes=len(res.content), latency=elapsed)
+                metrics.record_http(url, res.status_code, len(res.content), elapsed)
+                if limiter: limiter.observe(res.status_code, elapsed)
+                if res.status_code not in retry_statuses:
+                    return res
+                if attempt >= max_retries:
+                    self._record(failures=1)
+                    return res
+                delay = self._retry_after(res)
+                if delay is None:
+                    delay = self._backoff(attempt)
+            attempt += 1
+            self._record(retries=1)
+            metrics.record_retry(url)
+            with metrics.span('http.backoff'):
+                time.sleep(delay)
+
+
+@lru_cache(maxsize=None)
+def get_http_client():
+    return HttpClient()
+
+
+def format_http_stats(before, after):
+    """수집 전후 카운터 차이를 한 줄 요약으로 만듭니다."""
+    n = after['requests'] - before['requests']
+    latency = (after['latency'] - before['latency']) / n if n else 0.0
+    return (f"HTTP 요청 {n}회 · 재시도 {after['retries'] - before['retries']}회 · "
+            f"실패 {after['failures'] - before['failures']}회 · "
+            f"{(after['bytes'] - before['bytes']) / 1024 / 1024:.1f}MB · 평균 {latency * 1000:.0f}ms")
+
+
+http_client = get_http_client()
+
+
+# --- 💬 스팀 토론장 크롤러 (목록/상세 병렬 수집) ---
+DISCUSSION_WORKERS = 8
+STEAM_HEADERS = {'User-Agent': 'Mozilla/5.0', 'Accept-Language': 'ko-KR'}
+STEAM_COOKIES = {'wants_mature_content': '1', 'birthtime': '660000001', 'lastagecheckage': '1-January-1990'}
+DISCUSSION_COLUMNS = ['구분', '제목', '작성자', '내용', '링크']
+
+
+def fetch_discussion_page(url, limiter):
+    """토론장 목록 한 페이지에서 (링크, 제목) 목록을 추출합니다."""
+    res = http_client.get(url, limiter=limiter, headers=STEAM_HEADERS, cookies=STEAM_COOKIES, verify=False)
+    res.raise_for_status()
+    with metrics.span('parse.steam_discussion_list'):
+        return parse_discussion_topics(res.text)
+
+
+def fetch_discussion_topic(link, title, limiter):
+    """토론글 상세 페이지에서 본문과 댓글 행을 추출합니다. 재시도 후에도 실패하면 예외를 던집니다."""
+    sub_res = http_client.get(link, limiter=limiter, headers=STEAM_HEADERS, cookies=STEAM_COOKIES, verify=False)
+    sub_res.raise_for_status()
+    with metrics.span('parse.steam_discussion_topic'):
+        op, comments = parse_discussion_thread(sub_res.text)
+
+    rows = []
+    if op:
+        rows.append({'구분': '게시글', '제목': title, '작성자': op[0], '내용': op[1], '링크': link})
+    for c_author, c_text in comments:
+        rows.append({'구분': '댓글', '제목': f"(Re) {title}", '작성자': c_author, '내용': c_text, '링크': link})
+    return rows
+
+
+def crawl_discussions(target_url, pages, limiter, on_progress=None, on_rows=None):
+    """
+    목록 페이지와 토론글 상세를 워커 풀에서 병렬 수집합니다.
+    N페이지의 토론글 수집 중에 N+1페이지 목록을 미리 요청하며, 결과는 원래 순서대로 반환합니다.
+    on_progress(완료 페이지, 완료 토론글, 발견 토론글)와 on_rows(토론글 하나의 행 목록, 도착 순서)는 호출한 스레드에서 실행됩니다.
+    반환값: (행 목록, 실패한 토론글 수)
+    """
+    if not target_url.endswith('/') and '?' not in target_url: target_url += '/'
+    results = {}
+    pages_done = topics_done = topics_total = failed = 0
+
+    pool = ThreadPoolExecutor(max_workers=DISCUSSION_WORKERS)
+    try:
+        pending = {submit_in_context(pool, fetch_discussion_page, f"{target_url}?fp=1", limiter): ('page', 1)}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                kind, key = pending.pop(fut)
+                if kind == 'page':
+                    topics = fut.result()
+                    pages_done += 1
+                    if not topics: continue
+                    # 다음 목록 페이지를 먼저 넣어 상세 수집과 겹치게 합니다.
+                    if key < pages:
+                        pending[submit_in_context(pool, fetch_discussion_page, f"{target_url}?fp={key + 1}", limiter)] = ('page', key + 1)
+                    for idx, (link, title) in enumerate(topics):
+                        pending[submit_in_context(pool, fetch_discussion_topic, link, title, limiter)] = ('topic', (key, idx))
+                    topics_total += len(topics)
+                else:
+                    try:
+                        results[key] = fut.result()
+                    except Exception:
+                        failed += 1
+                    else:
+                        if on_rows: on_rows(results[key])
+                    topics_done += 1
+            if on_progress:
+                on_progress(pages_done, topics_done, topics_total)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return [row for key in sorted(results) for row in results[key]], failed
+
+
+# --- 🍀 4chan 수집기 (조건부 요청 캐시 + 병렬 스레드 수집) ---
+FOURCHAN_API = "https://a.4cdn.org"
+FOURCHAN_REQUESTS_PER_SEC = 1.0  # 4chan API 규칙: 초당 1회 이하
+FOURCHAN_MIN_REFRESH = 10        # 같은 URL은 10초 안에 다시 묻지 않음
+FOURCHAN_WORKERS = 4
+FOURCHAN_CACHE_MAX_ENTRIES = 2000
+
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+class ConditionalCache:
+    """
+    URL별 마지막 응답(JSON)과 ETag/Last-Modified를 보관하는 LRU 캐시 (스레드 안전)
+    counters: fresh(요청 생략) / not_modified(304) / fetched(200)
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {'fresh': 0, 'not_modified': 0, 'fetched': 0}
+
+    def get(self, url):
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                self.entries.move_to_end(url)
+            return entry
+
+    def put(self, url, data, etag, last_modified):
+        with self.lock:
+            self.entries[url] = {'data': data, 'etag': etag, 'last_modified': last_modified, 'checked': time.monotonic()}
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def touch(self, url):
+        with self.lock:
+            if url in self.entries:
+                self.entries[url]['checked'] = time.monotonic()
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+
+@lru_cache(maxsize=None)
+def get_fourchan_cache():
+    return ConditionalCache(FOURCHAN_CACHE_MAX_ENTRIES)
+
+
+fourchan_cache = get_fourchan_cache()
+
+
+def strip_4chan_html(com):
+    """4chan 'com' 필드의 HTML을 텍스트로 바꿉니다. (<br>은 줄바꿈, 나머지 태그 제거 후 엔티티 복원)"""
+    if not com:
+        return ""
+    return html.unescape(_TAG_RE.sub("", _BR_RE.sub("\n", com)))
+
+
+def fetch_4chan_json(url, limiter):
+    """
+    4chan API 조건부 GET
+    FOURCHAN_MIN_REFRESH초 안에 확인한 URL은 요청 없이, 304 응답이면 캐시된 JSON을 돌려줍니다.
+    삭제/보관된 스레드(404)는 None
+    """
+    entry = fourchan_cache.get(url)
+    if entry and time.monotonic() - entry['checked'] < FOURCHAN_MIN_REFRESH:
+        fourchan_cache.count('fresh')
+        return entry['data']
+
+    headers = {}
+    if entry:
+        if entry['etag']: headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']: headers['If-Modified-Since'] = entry['last_modified']
+    res = http_client.get(url, limiter=limiter, headers=headers, verify=False)
+    if res.status_code == 304 and entry:
+        fourchan_cache.touch(url)
+        fourchan_cache.count('not_modified')
+        return entry['data']
+    if res.status_code == 404:
+        return None
+    res.raise_for_status()
+
+    with metrics.span('parse.4chan_json'):
+        data = res.json()
+    fourchan_cache.put(url, data, res.headers.get('ETag'), res.headers.get('Last-Modified'))
+    fourchan_cache.count('fetched')
+    return data
+
+
+def fourchan_thread_rows(posts):
+    rows = []
+    for idx, post in enumerate(posts):
+        rows.append({
+            '구분': '원글' if idx == 0 else '댓글', '내용': strip_4chan_html(post.get('com', '')),
+            '작성일': datetime.fromtimestamp(post['time']).strftime('%Y-%m-%d %H:%M')
+        })
+    return rows
+
+
+def fetch_4chan_threads(threads, on_progress=None):
+    """
+    (게시판, 스레드 번호) 목록의 스레드 JSON을 워커 풀에서 동시에 받습니다. (호스트 토큰 버킷으로 초당 1회 유지)
+    on_progress(완료 수, 전체 수)는 호출한 스레드에서 실행됩니다. (여기서 예외가 나면 남은 요청은 취소됩니다)
+    재시도 후에도 실패한 스레드는 건너뛰고 수만 셉니다.
+    반환값: ({(게시판, 스레드 번호): 행 목록}, 실패한 스레드 수)
+    """
+    limiter = get_rate_limiter(urlparse(FOURCHAN_API).netloc, FOURCHAN_REQUESTS_PER_SEC)
+    rows_by_thread = {}
+    failed = 0
+    pool = ThreadPoolExecutor(max_workers=FOURCHAN_WORKERS)
+    try:
+        futures = {submit_in_context(pool, fetch_4chan_json, f"{FOURCHAN_API}/{board}/thread/{no}.json", limiter): (board, no)
+                   for board, no in threads}
+        for done, fut in enumerate(as_completed(futures), 1):
+            try:
+                data = fut.result()
+            except Exception:
+                failed += 1
+            else:
+                with metrics.span('parse.4chan_thread_rows'):
+                    rows_by_thread[futures[fut]] = fourchan_thread_rows((data or {}).get('posts', []))
+            if on_progress: on_progress(done, len(futures))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return rows_by_thread, failed
+
+
+# --- 🔎 4chan 카탈로그 역색인 (여러 게시판 x 여러 검색어) ---
+FOURCHAN_BOARDS = ['v', 'vg', 'vr', 'vp', 'vm', 'vmg', 'vrpg', 'vst', 'g']
+FOURCHAN_INDEX_CACHE_SIZE = 8
+_INDEX_TOKEN_RE = re.compile(r"\w+")
+
+
+class CatalogIndex:
+    """
+    카탈로그 스냅샷(게시판 여러 개)에 대한 역색인
+    각 스레드의 sub/com을 한 번만 정규화(소문자 + 단어 토큰)해 단어 → 스레드 위치 집합을 만들고,
+    검색어는 단어 교집합으로 후보를 고른 뒤 여러 단어면 붙어 있는지만 확인합니다.
+    """
+    def __init__(self, catalogs):
+        self.threads = []   # (게시판, 스레드 번호)
+        self.texts = []     # 공백 하나로 이어 붙인 정규화 토큰
+        self.postings = defaultdict(set)
+        for board, pages in catalogs.items():
+            for page in pages or []:
+                for thread in page.get('threads', []):
+                    raw = f"{strip_4chan_html(thread.get('sub', ''))}\n{strip_4chan_html(thread.get('com', ''))}"
+                    tokens = _INDEX_TOKEN_RE.findall(raw.lower())
+                    idx = len(self.threads)
+                    self.threads.append((board, thread['no']))
+                    self.texts.append(" ".join(tokens))
+                    for token in set(tokens):
+                        self.postings[token].add(idx)
+
+    def search(self, phrase):
+        """검색어 하나와 단어 단위로 일치하는 스레드 위치 목록 (카탈로그 순서)"""
+        tokens = _INDEX_TOKEN_RE.findall(phrase.lower())
+        if not tokens:
+            return []
+        postings = sorted((self.postings.get(t, set()) for t in tokens), key=len)
+        candidates = set.intersection(*postings)
+        if len(tokens) > 1:
+            needle = f" {' '.join(tokens)} "
+            candidates = {i for i in candidates if needle in f" {self.texts[i]} "}
+        return sorted(candidates)
+
+    def lookup(self, targets, limit):
+        """
+        {이름: [별칭, ...]} 여러 개를 한 번에 찾습니다.
+        반환값: {이름: [(게시판, 스레드 번호), ...]} (이름마다 최대 limit개)
+        """
+        found = {}
+        for name, aliases in targets.items():
+            hits = sorted(set().union(*(self.search(alias) for alias in aliases)))
+            found[name] = [self.threads[i] for i in hits[:limit]]
+        return found
+
+
+@lru_cache(maxsize=None)
+def _catalog_index_cache():
+    return OrderedDict(), threading.Lock()
+
+
+def get_catalog_index(boards):
+    """
+    게시판별 카탈로그를 (조건부 요청으로) 받고, 같은 스냅샷이면 만들어 둔 역색인을 재사용합니다.
+    카탈로그가 304/캐시로 돌아오면 같은 객체이므로 객체 id로 스냅샷을 구분합니다.
+    """
+    limiter = get_rate_limiter(urlparse(FOURCHAN_API).netloc, FOURCHAN_REQUESTS_PER_SEC)
+    pool = ThreadPoolExecutor(max_workers=FOURCHAN_WORKERS)
+    try:
+        futures = [submit_in_context(pool, fetch_4chan_json, f"{FOURCHAN_API}/{b}/catalog.json", limiter) for b in boards]
+        catalogs = dict(zip(boards, (fut.result() for fut in futures)))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    key = tuple((board, id(pages)) for board, pages in catalogs.items())
+    cache, lock = _catalog_index_cache()
+    with lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key][1]
+    with metrics.span('index.4chan_catalog'):
+        index = CatalogIndex(catalogs)
+    with lock:
+        # 카탈로그 객체를 함께 들고 있어야 id가 재사용되지 않습니다.
+        cache[key] = (catalogs, index)
+        while len(cache) > FOURCHAN_INDEX_CACHE_SIZE:
+            cache.popitem(last=False)
+    return index
+
+
+def parse_search_targets(text):
+    """한 줄에 게임 하나, 별칭은 쉼표로 구분 → {첫 이름: [별칭, ...]}"""
+    targets = {}
+    for line in text.splitlines():
+        aliases = [a.strip() for a in line.split(',') if a.strip()]
+        if aliases:
+            targets[aliases[0]] = aliases
+    return targets
+
+
+def collect_4chan(targets, boards, limit, on_progress=None):
+    """
+    카탈로그 역색인으로 검색어별 스레드를 찾고, 찾은 스레드의 글을 모두 받아 검색어 순서대로 행을 만듭니다.
+    반환값: (행 목록, 색인한 스레드 수, 찾은 스레드 수, 받지 못한 스레드 수)
+    """
+    index = get_catalog_index(boards)
+    found = index.lookup(targets, limit)
+    threads = list(dict.fromkeys(t for hits in found.values() for t in hits))
+    if not threads:
+        return [], len(index.threads), 0, 0
+
+    rows_by_thread, failed = fetch_4chan_threads(threads, on_progress=on_progress)
+    rows = [
+        {'검색어': name, '게시판': board, '스레드': no, **row}
+        for name, hits in found.items() for board, no in hits for row in rows_by_thread.get((board, no), [])
+    ]
+    return rows, len(index.threads), len(threads), failed
+
+
+# --- 🟥 YouTube API 클라이언트 (서비스 객체 재사용 + 디스크 응답 캐시) ---
+YT_CACHE_PATH = os.path.join(APP_DIR, "youtube_cache.db")
+YT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+YT_CACHE_TTL = {'search': 6 * 3600, 'videos': 3600, 'commentThreads': 1800, 'comments': 1800}
+YT_NUM_RETRIES = 3
+YT_QUOTA_COST = {'search': 100, 'videos': 1, 'commentThreads': 1, 'comments': 1}
+
+
+class QuotaMeter:
+    """YouTube Data API 호출별 쿼터 사용량 집계 (스레드 안전). 캐시 적중은 쿼터 0으로 따로 셉니다."""
+    def __init__(self):
+        self.calls = Counter()
+        self.cached = Counter()
+        self.lock = threading.Lock()
+
+    def add(self, endpoint, n=1):
+        with self.lock:
+            self.calls[endpoint] += n
+
+    def add_cached(self, endpoint, n=1):
+        with self.lock:
+            self.cached[endpoint] += n
+
+    @property
+    def units(self):
+        with self.lock:
+            return sum(YT_QUOTA_COST[name] * n for name, n in self.calls.items())
+
+    def summary(self):
+        with self.lock:
+            detail = " · ".join(f"{name} {n}회" for name, n in self.calls.items()) or "호출 없음"
+            cached = sum(self.cached.values())
+        return f"🧮 쿼터 사용량: {self.units} units ({detail}) · 캐시 적중 {cached}회"
+
+
+@lru_cache(maxsize=None)
+def _youtube_discovery_doc():
+    # 디스커버리 문서는 프로세스당 한 번만 읽고 파싱합니다.
+    return json.loads(discovery_cache.get_static_doc('youtube', 'v3'))
+
+
+@lru_cache(maxsize=None)
+def get_youtube_service(api_key):
+    """API 키별 서비스 객체 (프로세스 단위 재사용)"""
+    return build_from_document(_youtube_discovery_doc(), developerKey=api_key)
+
+
+@lru_cache(maxsize=None)
+def _youtube_http_local():
+    return threading.local()
+
+
+def _thread_http():
+    # 서비스 객체는 공유하되, httplib2 연결은 스레드마다 따로 씁니다. (스레드 간 공유 불가)
+    local = _yt_http_local
+    if not hasattr(local, 'http'):
+        local.http = build_http()
+    return local.http
+
+
+_yt_http_local = _youtube_http_local()
+
+
+@lru_cache(maxsize=None)
+def _init_youtube_cache():
+    with closing(sqlite3.connect(YT_CACHE_PATH, timeout=30)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+    return True
+
+
+def open_youtube_cache():
+    _init_youtube_cache()
+    return sqlite3.connect(YT_CACHE_PATH, timeout=30)
+
+
+def _youtube_cache_get(key, ttl):
+    with closing(open_youtube_cache()) as conn:
+        row = conn.execute("SELECT body, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[1] > ttl:
+            return None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+    return json.loads(row[0])
+
+
+def _youtube_cache_put(key, endpoint, response):
+    body = json.dumps(response, ensure_ascii=False)
+    now = time.time()
+    with closing(open_youtube_cache()) as conn:
+        conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                     (key, endpoint, body, len(body), now, now))
+        # 용량을 넘으면 오래 쓰지 않은 응답부터 지웁니다. (만료된 응답도 이때 함께 정리)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > YT_CACHE_MAX_BYTES:
+            for old_key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                if total <= YT_CACHE_MAX_BYTES * 0.9: break
+                conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                total -= size
+        conn.commit()
+    return len(body)
+
+
+def yt_execute(service, endpoint, quota, **params):
+    """
+    YouTube API list 호출. 같은 엔드포인트/파라미터의 응답이 TTL 안에 캐시에 있으면 쿼터 없이 돌려줍니다.
+    """
+    key = hashlib.sha256(json.dumps([endpoint, params], sort_keys=True).encode('utf-8')).hexdigest()
+    with metrics.span('store.youtube_cache_get'):
+        cached = _youtube_cache_get(key, YT_CACHE_TTL[endpoint])
+    if cached is not None:
+        quota.add_cached(endpoint)
+        return cached
+
+    quota.add(endpoint)
+    url = f"https://youtube.googleapis.com/youtube/v3/{endpoint}"
+    started = time.monotonic()
+    try:
+        response = getattr(service, endpoint)().list(**params).execute(http=_thread_http(), num_retries=YT_NUM_RETRIES)
+    except HttpError as e:
+        metrics.record_http(url, e.resp.status, 0, time.monotonic() - started)
+        raise
+    # googleapiclient가 본문을 이미 풀어서 주므로 바이트 수는 캐시에 쓰는 JSON 길이로 셉니다.
+    with metrics.span('store.youtube_cache_put'):
+        size = _youtube_cache_put(key, endpoint, response)
+    metrics.record_http(url, 200, size, time.monotonic() - started)
+    return response
+
+
+# --- 🟥 YouTube 댓글 수집 (영상별 병렬 + 페이지네이션 + 쿼터 집계) ---
+YT_COMMENT_WORKERS = 6
+
+
+def search_keyword_videos(youtube, keyword, start_date, end_date, max_videos, min_view_count, quota):
+    """
+    기간 안에 게시된 영상을 조회수 순으로 검색하고, 조회수 컷을 넘는 영상만 남깁니다.
+    반환값: (검색된 영상 수, 대상 영상 목록) - 영상은 videos().list 응답 항목(snippet, statistics) 그대로입니다.
+    """
+    start_dt = datetime.combine(start_date, dt_time.min).isoformat() + "Z"
+    end_dt = datetime.combine(end_date, dt_time.max).isoformat() + "Z"
+    search_response = yt_execute(
+        youtube, 'search', quota,
+        q=keyword, type='video', part='id', order='viewCount',
+        publishedAfter=start_dt, publishedBefore=end_dt, maxResults=max_videos
+    )
+    video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
+    if not video_ids:
+        return 0, []
+
+    stats_response = yt_execute(youtube, 'videos', quota, part='snippet,statistics', id=','.join(video_ids))
+    targets = [v_item for v_item in stats_response.get('items', [])
+               if int(v_item['statistics'].get('viewCount', 0)) >= min_view_count]
+    return len(video_ids), targets
+
+
+def fetch_video_comments(youtube, video, max_comments, quota):
+    """
+    영상 하나의 최상위 댓글을 nextPageToken으로 max_comments개까지 받습니다.
+    반환값: (행 목록, 오류 메시지 또는 None) - 댓글 사용 중지 등으로 실패해도 받은 데까지는 돌려줍니다.
+    """
+    v_title = video['snippet']['title']
+    v_views = video['statistics'].get('viewCount', 0)
+    v_date = video['snippet']['publishedAt'][:10]
+
+    rows = []
+    page_token = None
+    try:
+        while len(rows) < max_comments:
+            response = yt_execute(
+                youtube, 'commentThreads', quota,
+                part="snippet", videoId=video['id'], maxResults=min(100, max_comments - len(rows)),
+                textFormat="plainText", order="relevance", pageToken=page_token
+            )
+            for item in response.get('items', []):
+                c_snip = item['snippet']['topLevelComment']['snippet']
+                rows.append({
+                    '영상제목': v_title, '조회수': v_views, '영상게시일': v_date,
+                    '작성자': c_snip['authorDisplayName'], '댓글내용': c_snip['textDisplay'],
+                    '좋아요': c_snip['likeCount'], '댓글작성일': c_snip['publishedAt'][:10]
+                })
+            page_token = response.get('nextPageToken')
+            if not page_token: break
+    except HttpError as e:
+        return rows[:max_comments], e.reason or str(e)
+    return rows[:max_comments], None
+
+
+def collect_keyword_comments(youtube, videos, max_comments, quota, on_progress=None, on_rows=None):
+    """
+    여러 영상의 댓글 페이지를 워커 풀에서 동시에 받습니다.
+    on_progress(완료 영상 수, 전체 영상 수, 영상, 댓글 수, 오류)와 on_rows(영상 하나의 행 목록)는 호출한 스레드에서 실행됩니다.
+    콜백이 예외를 던지면 아직 시작하지 않은 영상은 취소합니다.
+    반환값: 영상 순서대로 이어 붙인 행 목록
+    """
+    results = {}
+    pool = ThreadPoolExecutor(max_workers=YT_COMMENT_WORKERS)
+    try:
+        futures = {submit_in_context(pool, fetch_video_comments, youtube, video, max_comments, quota): idx
+                   for idx, video in enumerate(videos)}
+        for done, fut in enumerate(as_completed(futures), 1):
+            idx = futures[fut]
+            rows, error = fut.result()
+            results[idx] = rows
+            if on_rows and rows: on_rows(rows)
+            if on_progress: on_progress(done, len(videos), videos[idx], len(rows), error)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return [row for idx in sorted(results) for row in results[idx]]
+
+
+# --- 🟥 YouTube 단일 영상 (답글 병렬 수집 + 청크 스트리밍) ---
+YT_REPLY_WORKERS = 6
+YT_SINGLE_COLUMNS = ['영상제목', '구분', '작성자', '댓글내용', '좋아요', '작성일', '댓글ID', '부모ID']  # 답글의 부모ID = 원댓글의 댓글ID
+
+
+def extract_video_id(url):
+    """watch?v=... 또는 youtu.be/... 주소에서 영상 ID를 꺼냅니다. (없으면 None)"""
+    if "v=" in url: return url.split("v=")[1].split("&")[0]
+    if "youtu.be" in url: return url.split("/")[-1].split("?")[0]
+    return None
+
+
+def _comment_row(v_title, kind, comment, parent_id=None):
+    """댓글/답글 리소스 → YT_SINGLE_COLUMNS 행 (답글은 parent_id = 원댓글 ID, 댓글 스레드 ID와 같음)"""
+    snip = comment['snippet']
+    return (v_title, kind, snip['authorDisplayName'], snip['textDisplay'], snip['likeCount'], snip['publishedAt'][:10],
+            comment['id'], parent_id or snip.get('parentId'))
+
+
+def fetch_comment_replies(youtube, parent_id, v_title, quota):
+    """댓글 하나의 답글 전체를 comments().list(parentId=...)로 받습니다. 반환값: (행 목록, 오류 메시지 또는 None)"""
+    rows = []
+    page_token = None
+    try:
+        while True:
+            response = yt_execute(
+                youtube, 'comments', quota,
+                part="snippet", parentId=parent_id, maxResults=100, textFormat="plainText", pageToken=page_token
+            )
+            rows.extend(_comment_row(v_title, '답글', item, parent_id) for item in response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token: return rows, None
+    except HttpError as e:
+        return rows, e.reason or str(e)
+
+
+def stream_video_comments(youtube, video_id, v_title, max_comments, quota, on_rows, include_replies=True):
+    """
+    영상 하나의 최상위 댓글을 페이지 순서대로 받으면서, 답글이 있는 댓글은 워커 풀에서 동시에 펼칩니다.
+    commentThreads 응답에 답글이 전부 들어 있으면(5개 이하) 추가 호출 없이 그대로 씁니다.
+    on_rows(행 목록)는 페이지/답글 묶음이 도착할 때마다 호출한 스레드에서 실행되며, 예외를 던지면 남은 답글 요청은 취소합니다.
+    반환값: 답글 수집에 실패한 댓글 수
+    """
+    failed = 0
+    pending = set()
+
+    def drain(futures):
+        nonlocal failed
+        for fut in futures:
+            rows, error = fut.result()
+            if error: failed += 1
+            if rows: on_rows(rows)
+
+    pool = ThreadPoolExecutor(max_workers=YT_REPLY_WORKERS)
+    try:
+        collected = 0
+        page_token = None
+        while collected < max_comments:
+            response = yt_execute(
+                youtube, 'commentThreads', quota,
+                part="snippet,replies" if include_replies else "snippet", videoId=video_id,
+                maxResults=min(100, max_comments - collected), textFormat="plainText",
+                pageToken=page_token, order="relevance"
+            )
+            rows = []
+            for item in response.get('items', []):
+                snippet = item['snippet']
+                rows.append(_comment_row(v_title, '댓글', snippet['topLevelComment']))
+                if not include_replies or snippet.get('totalReplyCount', 0) == 0: continue
+                inline = item.get('replies', {}).get('comments', [])
+                if len(inline) >= snippet['totalReplyCount']:
+                    rows.extend(_comment_row(v_title, '답글', reply, item['id']) for reply in inline)
+                else:
+                    pending.add(submit_in_context(pool, fetch_comment_replies, youtube, item['id'], v_title, quota))
+            collected += len(response.get('items', []))
+            on_rows(rows)
+
+            finished = {fut for fut in pending if fut.done()}
+            pending -= finished
+            drain(finished)
+
+            page_token = response.get('nextPageToken')
+            if not page_token: break
+
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            drain(finished)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return failed
+
+
+# --- 🔵 디시인사이드 수집기 (AIMD 속도 제어 + 본문 병렬 수집) ---
+DC_WORKERS = 4
+DC_MIN_RATE = 0.3   # 기존 2~4초 고정 대기와 비슷한 속도에서 시작
+DC_MAX_RATE = 3.0
+DC_RETRY_STATUSES = HTTP_RETRY_STATUSES | {403}
+# 모바일 위장 헤더 사용 (차단 우회용)
+DC_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Connection': 'keep-alive'
+}
+
+
+def dc_board_url(is_minor, kind='lists'):
+    return f"https://gall.dcinside.com/mgallery/board/{kind}/" if is_minor else f"https://gall.dcinside.com/board/{kind}/"
+
+
+def fetch_dc_list_page(url, params, headers, limiter):
+    """갤러리 목록 한 페이지 → [{'no', 'title'}, ...]. 재시도 후에도 막히면 예외를 던집니다."""
+    res = http_client.get(url, limiter=limiter, retry_statuses=DC_RETRY_STATUSES, headers=headers, params=params)
+    res.raise_for_status()
+    with metrics.span('parse.dc_list'):
+        return parse_dc_list(res.text)
+
+
+def fetch_dc_post(url, gallery_id, no, headers, limiter):
+    """게시글 상세 → {'body', 'comments'}"""
+    res = http_client.get(url, limiter=limiter, retry_statuses=DC_RETRY_STATUSES, headers=headers,
+                          params={'id': gallery_id, 'no': no})
+    res.raise_for_status()
+    with metrics.span('parse.dc_post'):
+        return parse_dc_post(res.text)
+
+
+def crawl_dc_gallery(gallery_id, is_minor, keyword, pages, limiter, fetch_posts=False, on_progress=None):
+    """
+    목록 페이지(와 선택 시 게시글 본문/댓글 수)를 워커 풀에서 수집합니다. 모든 요청이 같은 AIMD 버킷을 거칩니다.
+    목록 페이지가 재시도 후에도 실패하면 차단으로 보고 남은 목록 요청을 취소하며, 결과는 페이지 순서대로 반환합니다.
+    on_progress(완료 페이지, 완료 게시글, 발견 게시글)는 호출한 스레드에서 실행됩니다.
+    반환값: (행 목록, 실패한 게시글 수, 목록 오류 메시지 또는 None)
+    """
+    list_url, view_url = dc_board_url(is_minor), dc_board_url(is_minor, 'view')
+    headers = dict(DC_HEADERS, Referer=f"{list_url}?id={gallery_id}")
+    rows = {}
+    pages_done = posts_done = posts_total = failed = 0
+    list_error = None
+
+    def list_params(page):
+        params = {'id': gallery_id, 'page': page}
+        if keyword:
+            params['s_type'] = 'search_subject_memo'
+            params['s_keyword'] = keyword
+        return params
+
+    pool = ThreadPoolExecutor(max_workers=DC_WORKERS)
+    try:
+        pending = {submit_in_context(pool, fetch_dc_list_page, list_url, list_params(page), headers, limiter): ('page', page)
+                   for page in range(1, pages + 1)}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                kind, key = pending.pop(fut)
+                if kind == 'page':
+                    try:
+                        posts = fut.result()
+                    except Exception as e:
+                        if list_error is None:
+                            list_error = str(e)
+                            for other, (other_kind, _) in list(pending.items()):
+                                if other_kind == 'page' and other.cancel(): pending.pop(other)
+                        continue
+                    pages_done += 1
+                    for idx, post in enumerate(posts):
+                        rows[(key, idx)] = {'갤러리ID': gallery_id, '글번호': post['no'], '제목': post['title']}
+                        if fetch_posts:
+                            pending[submit_in_context(pool, fetch_dc_post, view_url, gallery_id, post['no'], headers, limiter)] = ('post', (key, idx))
+                    if fetch_posts: posts_total += len(posts)
+                else:
+                    try:
+                        detail = fut.result()
+                        rows[key].update({'본문': detail['body'], '댓글수': detail['comments']})
+                    except Exception:
+                        failed += 1
+                    posts_done += 1
+            if on_progress:
+                on_progress(pages_done, posts_done, posts_total)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return [rows[key] for key in sorted(rows)], failed, list_error
+
+
+# --- 🗄️ 스팀 리뷰 로컬 저장소 (SQLite, recommendationid 기준) ---
+REVIEW_DB_PATH = os.path.join(APP_DIR, "steam_reviews.db")
+REVIEW_MAX_PAGES = 200
+REVIEW_STREAM_WORKERS = 8
+REVIEW_READ_BATCH = 5000
+REVIEW_REQUESTS_PER_SEC = 10
+STEAM_LANGUAGES = [
+    'koreana', 'english', 'schinese', 'tchinese', 'japanese', 'russian', 'german', 'french', 'spanish', 'latam',
+    'brazilian', 'portuguese', 'italian', 'polish', 'turkish', 'ukrainian', 'czech', 'hungarian', 'dutch', 'danish',
+    'finnish', 'norwegian', 'swedish', 'greek', 'romanian', 'bulgarian', 'thai', 'vietnamese', 'indonesian', 'arabic'
+]
+REVIEW_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    app_id TEXT NOT NULL,
+    recommendationid TEXT NOT NULL,
+    language TEXT,
+    timestamp_created INTEGER NOT NULL,
+    review TEXT,
+    votes_up INTEGER,
+    voted_up INTEGER,
+    playtime_forever INTEGER,
+    PRIMARY KEY (app_id, recommendationid)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_app_ts ON reviews (app_id, timestamp_created);
+CREATE TABLE IF NOT EXISTS sync_state (
+    app_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    newest_ts INTEGER,
+    oldest_ts INTEGER,
+    exhausted INTEGER NOT NULL DEFAULT 0,
+    updated_at INTEGER,
+    backfill_cursor TEXT,
+    PRIMARY KEY (app_id, language)
+);
+"""
+REVIEW_UPSERT = """
+INSERT INTO reviews (app_id, recommendationid, language, timestamp_created, review, votes_up, voted_up, playtime_forever)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (app_id, recommendationid) DO UPDATE SET
+    review = excluded.review, votes_up = excluded.votes_up,
+    voted_up = excluded.voted_up, playtime_forever = excluded.playtime_forever
+"""
+
+
+@lru_cache(maxsize=None)
+def _init_review_db():
+    with closing(sqlite3.connect(REVIEW_DB_PATH, timeout=30)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(REVIEW_SCHEMA)
+        # 커서 컬럼이 생기기 전에 만든 저장소
+        if 'backfill_cursor' not in {row[1] for row in conn.execute("PRAGMA table_info(sync_state)")}:
+            conn.execute("ALTER TABLE sync_state ADD COLUMN backfill_cursor TEXT")
+    return True
+
+
+def open_review_db():
+    _init_review_db()
+    return sqlite3.connect(REVIEW_DB_PATH, timeout=30)
+
+
+def _day_start_ts(day):
+    return int(datetime.combine(day, dt_time.min, tzinfo=timezone.utc).timestamp())
+
+
+def fetch_review_page(app_id, language, cursor, limiter=None):
+    """리뷰 목록 한 페이지 (최신순 100개, JSON)"""
+    params = {
+        'json': 1, 'cursor': cursor, 'language': language,
+        'num_per_page': 100, 'purchase_type': 'all', 'filter': 'recent'
+    }
+    res = http_client.get(f"https://store.steampowered.com/appreviews/{app_id}", limiter=limiter, params=params, verify=False)
+    res.raise_for_status()
+    with metrics.span('parse.steam_reviews_json'):
+        return res.json()
+
+
+def _sync_state(conn, app_id, language, start_ts):
+    """
+    저장된 구간 (newest_ts, oldest_ts, exhausted, backfill_cursor) 또는 None과, 그 구간이 start_date까지 덮는지 여부
+    backfill_cursor: 저장 구간 아래쪽(더 오래된 리뷰)을 이어 받을 커서
+    """
+    state = conn.execute(
+        "SELECT newest_ts, oldest_ts, exhausted, backfill_cursor FROM sync_state WHERE app_id = ? AND language = ?",
+        (app_id, language)
+    ).fetchone()
+    return state, state is not None and bool(state[2] or state[1] <= start_ts)
+
+
+def review_span_left(state, start_ts, top_oldest=None, fill_oldest=None):
+    """
+    이번 수집이 아직 내려가야 할 리뷰 시간 구간(초)
+    저장 구간 위쪽(top_oldest부터 워터마크까지의 새 리뷰) + 아래쪽(fill_oldest 또는 oldest_ts부터 start_ts까지 되채우기)
+    """
+    top = top_oldest if top_oldest is not None else time.time()
+    if state is None:
+        return max(top - start_ts, 0)
+    newest_ts, oldest_ts, exhausted, _ = state
+    above = 0 if fill_oldest is not None else max(top - max(newest_ts, start_ts), 0)
+    below = 0 if exhausted else max((fill_oldest if fill_oldest is not None else oldest_ts) - start_ts, 0)
+    return above + below
+
+
+def estimate_review_target(fetched, walked, left):
+    """
+    지금까지 받은 리뷰의 시간 밀도(fetched / walked초)로, 남은 구간(left초)까지 받으면 모두 몇 개일지 어림합니다.
+    (REVIEW_MAX_PAGES 페이지 이하)
+    """
+    if not fetched or left <= 0:
+        return fetched
+    return min(REVIEW_MAX_PAGES * 100, fetched + round(fetched * left / max(walked, 1)))
+
+
+def sync_reviews(app_id, language, start_date, on_progress=None, on_summary=None, limiter=None, first_page=None, on_target=None):
+    """
+    저장소에 없는 리뷰만 받아옵니다. (한 번에 REVIEW_MAX_PAGES 페이지까지)
+    1) 최신 리뷰부터 저장된 최신 timestamp_created(워터마크)에 닿을 때까지 받고,
+    2) 저장된 구간이 start_date까지 내려가지 않았으면 지난번에 멈춘 커서(backfill_cursor)부터 그 날짜까지 이어 받습니다.
+    페이지 한도에 걸려 멈춰도 커서를 남기므로, 다시 실행하면 처음부터가 아니라 멈춘 곳부터 이어집니다.
+    on_summary는 첫 페이지의 query_summary로 한 번 호출됩니다. first_page를 주면 첫 페이지는 요청하지 않고 그대로 씁니다.
+    on_target(예상 수집 수)는 페이지마다 estimate_review_target의 어림값으로 호출됩니다.
+    반환값: 이번에 받아온 리뷰 수
+    """
+    start_ts = _day_start_ts(start_date)
+    with closing(open_review_db()) as conn:
+        state, covered = _sync_state(conn, app_id, language, start_ts)
+        newest_ts, oldest_ts, exhausted, backfill_cursor = state if state else (None, None, 0, None)
+
+        cursor = '*'
+        filling = state is None  # 저장 구간이 없으면 처음부터 start_date까지 채우는 중
+        joined = False
+        fetched = 0
+        seen_newest = top_oldest = fill_oldest = None
+        next_cursor = None
+        reached_end = False
+        for _ in range(REVIEW_MAX_PAGES):
+            if cursor == '*' and first_page is not None:
+                data = first_page
+            else:
+                data = fetch_review_page(app_id, language, cursor, limiter)
+            if cursor == '*' and on_summary: on_summary(data.get('query_summary') or {})
+            reviews = data.get('reviews') or []
+            if not reviews:
+                reached_end = True
+                break
+
+            with metrics.span('store.reviews_write'):
+                conn.executemany(REVIEW_UPSERT, (
+                    (app_id, str(r['recommendationid']), r.get('language'), r['timestamp_created'], r['review'],
+                     r['votes_up'], int(bool(r['voted_up'])), r['author'].get('playtime_forever', 0))
+                    for r in reviews
+                ))
+                conn.commit()
+
+            page_ts = [r['timestamp_created'] for r in reviews]
+            page_oldest = min(page_ts)
+            fetched += len(reviews)
+            seen_newest = max(seen_newest or 0, max(page_ts))
+            if filling and state is not None:
+                fill_oldest = min(fill_oldest or page_oldest, page_oldest)
+            else:
+                top_oldest = page_oldest
+            if on_progress: on_progress(fetched, page_oldest)
+
+            next_cursor = data.get('cursor')
+            if next_cursor in (None, cursor):
+                reached_end = True
+                break
+            if filling:
+                if page_oldest < start_ts: break
+            elif page_oldest <= newest_ts:
+                # 워터마크에 닿음: 저장 구간과 이어졌으니, 덮지 못한 아래쪽은 멈춘 커서부터 이어 받습니다.
+                joined = True
+                if covered: break
+                filling = True
+                next_cursor = backfill_cursor or next_cursor
+            elif page_oldest < start_ts:
+                break
+            cursor = next_cursor
+            if on_target:
+                walked = (seen_newest - top_oldest if top_oldest is not None else 0) + (oldest_ts - fill_oldest if fill_oldest is not None else 0)
+                on_target(estimate_review_target(fetched, walked, review_span_left(state, start_ts, top_oldest, fill_oldest)))
+
+        if fetched:
+            cursor_left = None if reached_end else next_cursor
+            if state is not None and joined:
+                # 저장 구간과 이어 붙입니다. 아래쪽을 더 받았으면 커서를 그 위치로 옮깁니다.
+                newest_ts = max(newest_ts, seen_newest)
+                exhausted = int(exhausted or (reached_end and filling))
+                if fill_oldest is not None or (reached_end and filling):
+                    oldest_ts, backfill_cursor = min(oldest_ts, fill_oldest or oldest_ts), cursor_left
+            else:
+                # 처음 받았거나 워터마크까지 닿지 못했으면 새 구간으로 교체합니다.
+                newest_ts, oldest_ts = seen_newest, fill_oldest if fill_oldest is not None else top_oldest
+                exhausted, backfill_cursor = int(reached_end), cursor_left
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (app_id, language, newest_ts, oldest_ts, exhausted, backfill_cursor, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (app_id, language, newest_ts, oldest_ts, exhausted, backfill_cursor, int(time.time()))
+            )
+            conn.commit()
+    return fetched
+
+
+def sync_reviews_by_language(app_id, start_date, on_progress=None):
+    """
+    language='all' 수집을 스팀 언어별 커서 스트림으로 나눠 동시에 실행합니다.
+    먼저 모든 언어의 첫 페이지를 받아(스트림이 그대로 이어 씀) 언어별 목표치를 잡습니다.
+    목표치는 start_date(또는 저장된 워터마크)까지의 리뷰 수를 리뷰 시각 밀도로 어림한 값이며,
+    query_summary.total_reviews에서 저장된 수를 뺀 값을 넘지 않습니다. 페이지를 받을 때마다 다시 어림합니다.
+    호출한 스레드에서 on_progress(수집 수, 목표 수, 남은 초 또는 None)를 호출합니다.
+    같은 리뷰가 여러 스트림에 나와도 저장소에서 recommendationid 기준으로 합쳐집니다.
+    반환값: 이번에 받아온 리뷰 수
+    """
+    limiter = get_rate_limiter('store.steampowered.com', REVIEW_REQUESTS_PER_SEC)
+    start_ts = _day_start_ts(start_date)
+    with closing(open_review_db()) as conn:
+        stored = dict(conn.execute(
+            "SELECT language, COUNT(*) FROM reviews WHERE app_id = ? GROUP BY language", (app_id,)
+        ).fetchall())
+        plans = {lang: _sync_state(conn, app_id, lang, start_ts) for lang in STEAM_LANGUAGES}
+
+    fetched = {lang: 0 for lang in STEAM_LANGUAGES}
+    targets, limits, first_pages = {}, {}, {}
+    stopped = threading.Event()
+
+    def on_stream_progress(lang, count):
+        # 바깥 루프가 예외(취소 등)로 끝났으면 아직 도는 스트림도 다음 페이지 전에 멈춥니다.
+        if stopped.is_set(): raise RuntimeError("수집이 중단되었습니다.")
+        fetched[lang] = count
+
+    def set_target(lang, estimate):
+        targets[lang] = min(estimate, limits[lang])
+
+    def fetch_first_page(lang):
+        data = fetch_review_page(app_id, lang, '*', limiter)
+        state, covered = plans[lang]
+        # 저장 구간을 다시 내려가지 않는 경우(워터마크까지만, 또는 커서부터 되채우기)엔 저장된 만큼을 상한에서 뺍니다.
+        # (워터마크에 닿는 페이지 하나는 겹쳐서 다시 받습니다)
+        total = (data.get('query_summary') or {}).get('total_reviews', 0)
+        resumes = state is None or covered or state[3] is not None
+        limits[lang] = min(max(total - stored.get(lang, 0), 0) + 100 if resumes else total, REVIEW_MAX_PAGES * 100)
+        ts = [r['timestamp_created'] for r in data.get('reviews') or []]
+        if ts and data.get('cursor') not in (None, '*'):
+            left = review_span_left(state, start_ts, top_oldest=min(ts))
+            set_target(lang, estimate_review_target(len(ts), max(ts) - min(ts), left))
+        else:
+            set_target(lang, len(ts))
+        first_pages[lang] = data
+
+    def run_stream(lang):
+        n = sync_reviews(app_id, lang, start_date,
+                         on_progress=lambda count, ts: on_stream_progress(lang, count),
+                         limiter=limiter, first_page=first_pages.pop(lang),
+                         on_target=lambda estimate: set_target(lang, estimate))
+        targets[lang] = fetched[lang] = n
+        return n
+
+    def report():
+        if not on_progress:
+            return
+        done = sum(fetched.values())
+        target = sum(max(targets.get(lang, 0), fetched[lang]) for lang in STEAM_LANGUAGES)
+        eta = None
+        if len(targets) == len(STEAM_LANGUAGES) and done:
+            eta = max(target - done, 0) / (done / (time.monotonic() - started))
+        on_progress(done, target, eta)
+
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=REVIEW_STREAM_WORKERS)
+    try:
+        pending = {submit_in_context(pool, fetch_first_page, lang) for lang in STEAM_LANGUAGES}
+        while pending:
+            finished, pending = wait(pending, timeout=0.5)
+            for fut in finished:
+                fut.result()
+            report()
+
+        pending = {submit_in_context(pool, run_stream, lang) for lang in STEAM_LANGUAGES}
+        while pending:
+            finished, pending = wait(pending, timeout=0.5)
+            for fut in finished:
+                fut.result()
+            report()
+    finally:
+        stopped.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+    return sum(fetched.values())
+
+
+def load_reviews(app_id, language, start_date, end_date):
+    """
+    저장소에서 기간/언어에 맞는 리뷰를 읽어 화면용 DataFrame으로 만듭니다. (네트워크 사용 없음)
+    기간 필터는 SQL에서 처리하고, 행은 타입별 컬럼 버퍼에 바로 쌓아 복사 없이 프레임으로 감쌉니다.
+    """
+    sql = ("SELECT timestamp_created, review, votes_up, COALESCE(voted_up, 0), COALESCE(playtime_forever, 0), "
+           "language, recommendationid FROM reviews "
+           "WHERE app_id = ? AND timestamp_created >= ? AND timestamp_created < ?")
+    params = [app_id, _day_start_ts(start_date), _day_start_ts(end_date + timedelta(days=1))]
+    if language != 'all':
+        sql += " AND language = ?"
+        params.append(language)
+    sql += " ORDER BY timestamp_created DESC"
+
+    ts, votes, voted, playtime = array('q'), array('q'), array('b'), array('q')
+    texts, langs, ids = [], [], []
+    with metrics.span('store.reviews_read'), closing(open_review_db()) as conn:
+        cur = conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(REVIEW_READ_BATCH)
+            if not rows: break
+            c_ts, c_text, c_votes, c_voted, c_play, c_lang, c_id = zip(*rows)
+            ts.extend(c_ts); votes.extend(c_votes); voted.extend(c_voted); playtime.extend(c_play)
+            texts.extend(c_text); langs.extend(c_lang); ids.extend(c_id)
+
+    with metrics.span('dataframe.steam_reviews'):
+        ts = np.frombuffer(ts, dtype=np.int64)
+        return pd.DataFrame({
+            '작성일': ts.astype('datetime64[s]').astype('datetime64[D]').astype('datetime64[s]'),  # 날짜(UTC 자정)로 내림, 파이썬 객체 없이
+            '내용': pd.Series(texts, dtype=object).str.replace('\n', ' ', regex=False),
+            '추천수': np.frombuffer(votes, dtype=np.int64),
+            '플레이시간(분)': np.frombuffer(playtime, dtype=np.int64),
+            '추천여부': np.frombuffer(voted, dtype=np.int8).astype(bool),
+            '언어': langs,
+            '리뷰ID': ids,
+        }, copy=False)
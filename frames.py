@@ -0,0 +1,88 @@
+"""
+수집 결과 DataFrame 다루기 (Streamlit 의존성 없음)
+세션에 넣기 전 dtype 압축(compact_frame)과 내보내기 바이트 생성(export_bytes)을 담습니다.
+app.py는 여기에 세션 메모리 예산과 st.cache_data 캐시만 얹어서 씁니다.
+"""
+import gzip
+import hashlib
+import io
+
+import pandas as pd
+
+from analysis import column_fingerprint
+from instrumentation import metrics
+
+
+# --- 🧮 dtype 압축 ---
+CATEGORY_MAX_RATIO = 0.5
+FREE_TEXT_COLUMNS = {'내용', '댓글내용', '본문', '제목'}
+NUMERIC_COLUMNS = {'추천수', '좋아요', '플레이시간(분)', '조회수', '댓글수'}
+DATE_COLUMNS = {'작성일', '영상게시일', '댓글작성일'}
+
+
+def frame_memory(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def format_bytes(n):
+    return f"{n / 1024 / 1024:.1f}MB" if n >= 1024 * 1024 else f"{n / 1024:.0f}KB"
+
+
+def compact_frame(df):
+    """
+    수집 직후 한 번 dtype을 줄입니다.
+    날짜는 datetime64, 숫자는 가장 작은 정수형(결측이 있으면 float), 값이 반복되는 문자열 컬럼은 category로 바꿉니다.
+    (본문/댓글 같은 자유 텍스트는 그대로 둡니다)
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col in DATE_COLUMNS:
+            if not pd.api.types.is_datetime64_any_dtype(values):  # load_reviews의 '작성일'은 이미 datetime64
+                values = pd.to_datetime(values, errors='coerce')
+        elif col in NUMERIC_COLUMNS:
+            values = pd.to_numeric(values, errors='coerce')
+            values = pd.to_numeric(values, downcast='integer' if values.notna().all() else 'float')
+        elif (col not in FREE_TEXT_COLUMNS and len(values)
+              and (values.dtype == object or pd.api.types.is_string_dtype(values))
+              and values.nunique() <= len(values) * CATEGORY_MAX_RATIO):
+            values = values.astype('category')
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+# --- 💾 내보내기 ---
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+EXPORT_CHUNK_ROWS = 20000
+
+
+def frame_fingerprint(df):
+    """컬럼 이름 + 전체 행 내용의 해시. 같은 데이터면 다른 객체/세션이어도 같은 값입니다."""
+    return hashlib.blake2b(f"{list(df.columns)!r}:{column_fingerprint(df)}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _write_csv_chunks(df, stream):
+    # 한 번에 거대한 문자열을 만들지 않도록 EXPORT_CHUNK_ROWS 행씩 이어 씁니다. (엑셀 호환 utf-8-sig)
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    for start in range(0, max(len(df), 1), EXPORT_CHUNK_ROWS):
+        df.iloc[start:start + EXPORT_CHUNK_ROWS].to_csv(text, header=(start == 0), index=False)
+    text.flush()
+    text.detach()  # 아래 스트림(BytesIO/GzipFile)은 닫지 않음
+
+
+def export_bytes(fmt, df):
+    """EXPORT_FORMATS의 형식 하나로 직렬화한 바이트"""
+    buf = io.BytesIO()
+    with metrics.span(f"export.{EXPORT_FORMATS[fmt][0]}"):
+        if fmt == "Parquet":
+            df.to_parquet(buf, index=False, compression='zstd')
+        elif fmt == "CSV (gzip)":
+            with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as gz:
+                _write_csv_chunks(df, gz)
+        else:
+            _write_csv_chunks(df, buf)
+    return buf.getvalue()
@@ -0,0 +1,220 @@
+"""
+수집/분석 단계 계측 (Streamlit 의존성 없음)
+네트워크 대기, 속도 제한 대기, 파싱, 저장소 읽기/쓰기, DataFrame 생성, 형태소 분석, 워드 클라우드 렌더링 같은
+단계별 소요 시간과 호스트별 HTTP 요청 수/바이트/상태 코드/재시도 횟수를 모읍니다.
+- metrics.span(이름): 구간 시간 측정 (with 문). 꺼져 있으면 공용 nullcontext를 돌려주므로 비용이 거의 없습니다.
+- metrics.run(이름): 한 번의 수집 실행 동안 기록된 값만 따로 모읍니다. (화면의 '마지막 실행' 진단용)
+  실행은 contextvars로 추적하므로 다른 세션/작업의 기록은 섞이지 않습니다.
+  워커 풀에 일을 넘길 때는 submit_in_context(pool, ...)로 제출해야 그 스레드의 기록도 같은 실행에 잡힙니다.
+- 켜고 끄기는 프로세스 설정입니다. (환경 변수 METRICS_ENABLED=0이면 끔, 기본 켬)
+- metrics.prometheus(): 프로세스 누적값을 Prometheus 텍스트 형식으로, start_metrics_server(포트)로 /metrics 제공
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1").lower() not in ("0", "false", "off", "no")
+_NULL_SPAN = nullcontext()
+_current_run = contextvars.ContextVar('metric_run', default=None)
+
+
+class MetricTotals:
+    """단계별 [호출 수, 누적 초, 최대 초]와 호스트별 HTTP 집계 (잠금은 Metrics가 잡습니다)"""
+    def __init__(self):
+        self.spans = {}
+        self.http = {}
+
+    def add_span(self, name, seconds):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def _host(self, host):
+        entry = self.http.get(host)
+        if entry is None:
+            entry = self.http[host] = {'requests': 0, 'bytes': 0, 'seconds': 0.0, 'retries': 0, 'status': Counter()}
+        return entry
+
+    def add_http(self, host, status, size, seconds):
+        entry = self._host(host)
+        entry['requests'] += 1
+        entry['bytes'] += size
+        entry['seconds'] += seconds
+        entry['status'][str(status) if status is not None else 'error'] += 1
+
+    def add_retry(self, host):
+        self._host(host)['retries'] += 1
+
+    def as_dict(self):
+        return {
+            'spans': {name: {'count': c, 'seconds': round(s, 6), 'max': round(m, 6)}
+                      for name, (c, s, m) in sorted(self.spans.items())},
+            'http': {host: dict(entry, seconds=round(entry['seconds'], 6), status=dict(entry['status']))
+                     for host, entry in sorted(self.http.items())},
+        }
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class MetricRun:
+    """metrics.run()이 돌려주는 실행 하나의 기록 (parent: 바깥쪽 실행, 기록은 바깥쪽에도 함께 더해집니다)"""
+    def __init__(self, label, parent=None):
+        self.label = label
+        self.parent = parent
+        self.started_at = time.time()
+        self.seconds = None
+        self.totals = MetricTotals()
+
+    def as_dict(self):
+        return dict(label=self.label, started_at=self.started_at, seconds=self.seconds, **self.totals.as_dict())
+
+
+class Metrics:
+    """
+    프로세스 단위 계측기 (스레드 안전)
+    기록은 누적 합계와, 기록한 컨텍스트의 현재 run(과 그 바깥쪽 run들)에 더해집니다.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.totals = MetricTotals()
+
+    @staticmethod
+    def _runs():
+        run = _current_run.get()
+        while run is not None:
+            yield run
+            run = run.parent
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.totals.add_span(name, seconds)
+            for run in self._runs():
+                run.totals.add_span(name, seconds)
+
+    def record_http(self, url, status, size, seconds):
+        """HTTP 시도 한 번 (status가 None이면 연결 오류)"""
+        if not self.enabled:
+            return
+        host = urlparse(url).netloc or url
+        with self.lock:
+            self.totals.add_http(host, status, size, seconds)
+            for run in self._runs():
+                run.totals.add_http(host, status, size, seconds)
+
+    def record_retry(self, url):
+        if not self.enabled:
+            return
+        host = urlparse(url).netloc or url
+        with self.lock:
+            self.totals.add_retry(host)
+            for run in self._runs():
+                run.totals.add_retry(host)
+
+    @contextmanager
+    def run(self, label):
+        """with 블록 동안의 기록만 모은 MetricRun을 돌려줍니다. (꺼져 있으면 빈 기록)"""
+        run = MetricRun(label, _current_run.get())
+        started = time.perf_counter()
+        token = _current_run.set(run)
+        try:
+            yield run
+        finally:
+            run.seconds = round(time.perf_counter() - started, 6)
+            _current_run.reset(token)
+
+    def snapshot(self):
+        with self.lock:
+            return self.totals.as_dict()
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def prometheus(self):
+        """프로세스 누적값 → Prometheus 텍스트 노출 형식"""
+        snap = self.snapshot()
+        families = [
+            ('crawler_stage_calls_total', "단계 호출 수", [({'stage': n}, v['count']) for n, v in snap['spans'].items()]),
+            ('crawler_stage_seconds_total', "단계 누적 소요 시간(초)", [({'stage': n}, v['seconds']) for n, v in snap['spans'].items()]),
+            ('crawler_http_requests_total', "HTTP 시도 수 (상태 코드별)",
+             [({'host': h, 'status': s}, n) for h, v in snap['http'].items() for s, n in sorted(v['status'].items())]),
+            ('crawler_http_response_bytes_total', "HTTP 응답 바이트", [({'host': h}, v['bytes']) for h, v in snap['http'].items()]),
+            ('crawler_http_seconds_total', "HTTP 응답 대기 누적 시간(초)", [({'host': h}, v['seconds']) for h, v in snap['http'].items()]),
+            ('crawler_http_retries_total', "HTTP 재시도 수", [({'host': h}, v['retries']) for h, v in snap['http'].items()]),
+        ]
+        lines = []
+        for name, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+metrics = Metrics(enabled=METRICS_ENABLED)
+
+
+def submit_in_context(pool, fn, *args, **kwargs):
+    """pool.submit과 같지만, 제출한 쪽의 컨텍스트(현재 run)를 복사해 워커 스레드에서 실행합니다."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@lru_cache(maxsize=None)
+def start_metrics_server(port, host="0.0.0.0"):
+    """/metrics를 내보내는 HTTP 서버를 데몬 스레드로 한 번만 띄웁니다. (같은 포트로 다시 부르면 기존 서버)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
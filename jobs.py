@@ -0,0 +1,214 @@
+"""
+백그라운드 수집 작업 (Streamlit 의존성 없음)
+수집 함수를 프로세스 공용 워커 풀에서 돌리고, 화면은 작업 ID로 진행 상황/부분 결과를 주기적으로 읽어 갑니다.
+- 대기열은 JOB_QUEUE_LIMIT개까지만 받습니다. (넘치면 JobQueueFull)
+- 같은 키(수집 대상/조건)로 진행 중인 작업이 있으면 새로 돌리지 않고 그 작업에 합류합니다.
+- 취소는 협조 방식입니다. 작업 함수가 job.update()/add_rows()를 부를 때 CollectionCancelled가 던져지고,
+  수집기들은 이 예외로 빠져나가면서 남은 요청을 취소합니다.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from instrumentation import metrics
+
+JOB_WORKERS = 4
+JOB_QUEUE_LIMIT = 8
+JOB_RETENTION_SECONDS = 30 * 60  # 끝난 작업은 30분 동안 결과를 보관
+JOB_LOG_LINES = 200
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+
+class CollectionCancelled(Exception):
+    """작업 취소 요청 (진행 콜백에서 던져져 수집기를 빠져나옵니다)"""
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    """
+    작업 하나의 상태/진행/부분 결과 (스레드 안전)
+    작업 함수는 job을 인자로 받아 update/log/add_rows로 진행을 알리고, 반환값이 job.result가 됩니다.
+    log()는 취소를 확인하지 않으므로 finally 블록에서 요약을 남길 때도 쓸 수 있습니다.
+    subscribers: 이 작업을 보고 있는 세션 수. 모두 손을 떼야(release) 실제로 취소됩니다.
+    끝난 작업의 행/결과는 마지막 세션이 가져가면(take) 비웁니다. (세션 쪽 DataFrame과 이중으로 들고 있지 않도록)
+    """
+    def __init__(self, key, label):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.label = label
+        self.state = QUEUED
+        self.done = 0
+        self.total = None
+        self.message = "대기 중"
+        self.logs = []
+        self.rows = []
+        self.result = None
+        self.error = None
+        self.diagnostics = None
+        self.subscribers = 1
+        self.created_at = time.time()
+        self.started_at = self.finished_at = None
+        self.future = None
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+
+    @property
+    def active(self):
+        return self.state in (QUEUED, RUNNING)
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise CollectionCancelled(self.id)
+
+    def update(self, done=None, total=None, message=None):
+        self.check()
+        with self.lock:
+            if done is not None: self.done = done
+            if total is not None: self.total = total
+            if message is not None: self.message = message
+
+    def log(self, line):
+        with self.lock:
+            self.logs.append(line)
+            del self.logs[:-JOB_LOG_LINES]
+
+    def add_rows(self, rows):
+        self.check()
+        with self.lock:
+            self.rows.extend(rows)
+
+    def partial_rows(self):
+        with self.lock:
+            return list(self.rows)
+
+    def snapshot(self):
+        with self.lock:
+            end = self.finished_at or time.time()
+            return {
+                'id': self.id, 'label': self.label, 'state': self.state, 'done': self.done, 'total': self.total,
+                'message': self.message, 'logs': list(self.logs), 'rows': len(self.rows), 'error': self.error,
+                'subscribers': self.subscribers, 'elapsed': end - (self.started_at or end),
+            }
+
+
+class JobManager:
+    """프로세스 공용 작업 관리자: 워커 풀 + 작업 목록 + 키별 진행 중 작업"""
+    def __init__(self, workers=JOB_WORKERS, queue_limit=JOB_QUEUE_LIMIT, retention=JOB_RETENTION_SECONDS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.queue_limit = queue_limit
+        self.retention = retention
+        self.jobs = OrderedDict()
+        self.running = {}  # 키 → 진행 중(대기 포함) 작업
+        self.lock = threading.Lock()
+
+    def submit(self, key, label, func):
+        """
+        func(job)을 워커 풀에 넣습니다. 같은 키의 작업이 진행 중이면 그 작업에 합류합니다.
+        반환값: (Job, 합류 여부)
+        """
+        with self.lock:
+            self._prune()
+            job = self.running.get(key)
+            if job is not None and job.active and not job.cancel_event.is_set():
+                with job.lock:
+                    job.subscribers += 1
+                return job, True
+            queued = sum(1 for j in self.running.values() if j.state == QUEUED)
+            if queued >= self.queue_limit:
+                raise JobQueueFull(f"대기 중인 작업이 {queued}개라 더 받을 수 없습니다. 잠시 후 다시 시도하세요.")
+            job = Job(key, label)
+            self.jobs[job.id] = job
+            self.running[key] = job
+            job.future = self.pool.submit(self._run, job, func)
+        return job, False
+
+    def _run(self, job, func):
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED)
+            return
+        with job.lock:
+            job.state, job.started_at, job.message = RUNNING, time.time(), "시작"
+        state, result, error = DONE, None, None
+        with metrics.run(job.label) as run:
+            try:
+                result = func(job)
+            except CollectionCancelled:
+                state = CANCELLED
+            except Exception as e:
+                state, error = FAILED, f"{type(e).__name__}: {e}"
+        if metrics.enabled:
+            job.diagnostics = run.as_dict()
+        self._finish(job, state, result, error)
+
+    def _finish(self, job, state, result=None, error=None):
+        with job.lock:
+            job.state, job.result, job.error, job.finished_at = state, result, error, time.time()
+            if job.subscribers == 0:  # 아무도 가져가지 않을 결과
+                job.rows, job.result = [], None
+        with self.lock:
+            if self.running.get(job.key) is job:
+                del self.running[job.key]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def take(self, job_id):
+        """
+        끝난 작업의 결과를 가져가며 손을 뗍니다.
+        반환값: 완료된 작업의 반환값, 반환값이 없거나 취소/실패면 그때까지 쌓인 행 목록
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with job.lock:
+            result = job.result if job.state == DONE and job.result is not None else list(job.rows)
+        self.release(job_id)
+        return result
+
+    def release(self, job_id):
+        """
+        세션 하나가 작업에서 손을 뗍니다. 보는 세션이 없어진 진행 중 작업은 취소하고,
+        끝난 작업이면 결과/행을 비웁니다. (상태/로그는 보관 시간 동안 남김)
+        """
+        job = self.get(job_id)
+        if job is None:
+            return
+        with job.lock:
+            job.subscribers = max(0, job.subscribers - 1)
+            abandon = job.subscribers == 0 and job.state in (QUEUED, RUNNING)
+            if job.subscribers == 0 and not abandon:
+                job.rows, job.result = [], None
+        if abandon:
+            self.cancel(job_id)
+
+    def cancel(self, job_id):
+        """구독은 그대로 두고 작업을 취소합니다. (취소한 세션이 부분 결과를 가져갈 수 있도록)"""
+        job = self.get(job_id)
+        if job is None:
+            return
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [j.id for j in self.jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def stats(self):
+        with self.lock:
+            states = [j.state for j in self.jobs.values()]
+        return {state: states.count(state) for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+
+
+@lru_cache(maxsize=None)
+def get_job_manager():
+    return JobManager()
@@ -0,0 +1,106 @@
+"""
+HTML 파서 모음 (lxml + 미리 컴파일한 XPath)
+스팀 토론장/디시인사이드 페이지에서 필요한 노드만 골라 평범한 tuple/dict 레코드로 돌려줍니다.
+Streamlit에 의존하지 않으므로 벤치마크나 다른 스크립트에서도 그대로 import 할 수 있습니다.
+"""
+import re
+
+from lxml import etree
+from lxml import html as lxml_html
+
+
+def _has_class(name):
+    # BeautifulSoup의 class_='name'과 같은 의미 (공백으로 나뉜 클래스 중 하나가 정확히 일치)
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 스팀 토론장 목록
+_TOPIC_ROWS = etree.XPath(f"//div[{_has_class('forum_topic')}]")
+_TOPIC_LINK = etree.XPath(f"(.//a[{_has_class('forum_topic_overlay')}])[1]/@href")
+_TOPIC_NAME = etree.XPath(f"(.//div[{_has_class('forum_topic_name')}])[1]")
+
+# 스팀 토론글 상세
+_FORUM_OP = etree.XPath(f"(//div[{_has_class('forum_op')}])[1]")
+_OP_AUTHOR = etree.XPath(f"(.//a[{_has_class('forum_op_author')}])[1]")
+_OP_CONTENT = etree.XPath(f"(.//div[{_has_class('content')}])[1]")
+_COMMENTS = etree.XPath(f"//div[{_has_class('commentthread_comment')}]")
+_COMMENT_TEXT = etree.XPath(f"(.//div[{_has_class('commentthread_comment_text')}])[1]")
+_COMMENT_AUTHOR = etree.XPath(f"(.//a[{_has_class('commentthread_author_link')}])[1]")
+
+# 디시인사이드 목록
+_DC_ROWS = etree.XPath(f"//tr[{_has_class('ub-content')}]")
+_DC_TITLE = etree.XPath(f"(.//td[{_has_class('gall_tit')}]//a)[1]")
+
+# 디시인사이드 게시글 상세
+_DC_BODY = etree.XPath(f"(//div[{_has_class('write_div')}])[1]")
+_DC_COMMENT_COUNT = etree.XPath(f"(//span[{_has_class('gall_comment')}])[1]")
+_DIGITS = re.compile(r"\d+")
+
+
+def _document(text):
+    if not text or not text.strip():
+        return None
+    return lxml_html.document_fromstring(text)
+
+
+def _text(nodes):
+    return nodes[0].text_content().strip() if nodes else ""
+
+
+def parse_discussion_topics(text):
+    """스팀 토론장 목록 페이지 → [(링크, 제목), ...]"""
+    doc = _document(text)
+    if doc is None:
+        return []
+    topics = []
+    for row in _TOPIC_ROWS(doc):
+        link = _TOPIC_LINK(row)
+        if not link: continue
+        title_nodes = _TOPIC_NAME(row)
+        topics.append((str(link[0]), _text(title_nodes) if title_nodes else "제목 없음"))
+    return topics
+
+
+def parse_discussion_thread(text):
+    """
+    스팀 토론글 상세 페이지 → (본문, 댓글 목록)
+    본문은 (작성자, 내용) 또는 None, 댓글은 [(작성자, 내용), ...] 이며 내용이 빈 댓글은 뺍니다.
+    """
+    doc = _document(text)
+    if doc is None:
+        return None, []
+
+    op = None
+    op_div = _FORUM_OP(doc)
+    if op_div:
+        op = (_text(_OP_AUTHOR(op_div[0])), _text(_OP_CONTENT(op_div[0])))
+
+    comments = []
+    for comm in _COMMENTS(doc):
+        c_text = _text(_COMMENT_TEXT(comm))
+        if c_text:
+            comments.append((_text(_COMMENT_AUTHOR(comm)), c_text))
+    return op, comments
+
+
+def parse_dc_list(text):
+    """디시인사이드 갤러리 목록 페이지 → [{'no', 'title'}, ...] (공지 제외)"""
+    doc = _document(text)
+    if doc is None:
+        return []
+    posts = []
+    for row in _DC_ROWS(doc):
+        if 'ub-notice' in (row.get('class') or '').split(): continue
+        title_nodes = _DC_TITLE(row)
+        if not title_nodes: continue
+        posts.append({'no': row.get('data-no'), 'title': _text(title_nodes)})
+    return posts
+
+
+def parse_dc_post(text):
+    """디시인사이드 게시글 상세 페이지 → {'body', 'comments'} (댓글 수를 찾지 못하면 None)"""
+    doc = _document(text)
+    if doc is None:
+        return {'body': "", 'comments': None}
+    count = _DIGITS.search(_text(_DC_COMMENT_COUNT(doc)))
+    return {'body': _text(_DC_BODY(doc)), 'comments': int(count.group()) if count else None}
@@ -0,0 +1,124 @@
+"""
+수집기 재생 테스트 (토론장 / 디시인사이드 / 4chan)
+benchmarks/replay.py의 재생기로 네트워크 없이 수집 함수 전체를 돌리고, 일부 URL만 계속 실패시켜
+재시도 후 건너뛰는 경로도 확인합니다.
+"""
+import os
+import sys
+
+import pytest
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import collectors  # noqa: E402
+from replay import ReplayRouter, ReplayAdapter  # noqa: E402
+
+MAX_RETRIES = 1
+DISCUSSION_URL = "https://steamcommunity.com/app/1562700/discussions/"
+
+
+class FailingRouter(ReplayRouter):
+    """URL에 failing의 문자열 중 하나가 들어 있으면 항상 503을 돌려주는 재생기"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = set()
+        self.failed_requests = 0
+
+    def handle(self, url, headers=None):
+        if any(part in url for part in self.failing):
+            self._count('requests')
+            with self.lock:
+                self.failed_requests += 1
+            return 503, {}, b""
+        return super().handle(url, headers)
+
+
+@pytest.fixture
+def router(monkeypatch):
+    router = FailingRouter()
+    session = requests.Session()
+    session.mount('https://', ReplayAdapter(router))
+    monkeypatch.setattr(collectors.http_client, 'session', session)
+    monkeypatch.setattr(collectors.http_client, 'backoff_base', 0.0)
+    monkeypatch.setattr(collectors, 'FOURCHAN_REQUESTS_PER_SEC', 10_000)
+    monkeypatch.setattr(collectors, 'fourchan_cache', collectors.ConditionalCache(collectors.FOURCHAN_CACHE_MAX_ENTRIES))
+    collectors._catalog_index_cache.cache_clear()
+    with collectors.http_client.retry_limit(MAX_RETRIES):
+        yield router
+    collectors._catalog_index_cache.cache_clear()
+
+
+def fast_limiter():
+    return collectors.get_rate_limiter('steamcommunity.com', 10_000)
+
+
+def dc_limiter():
+    return collectors.get_adaptive_limiter('gall.dcinside.com', 10_000, 10_000)
+
+
+# --- 스팀 토론장 ---
+def test_discussions_in_page_order(router):
+    rows, failed = collectors.crawl_discussions(DISCUSSION_URL, 2, fast_limiter())
+    assert failed == 0
+    assert len(rows) == 2 * 15 * 16  # 페이지 2개 x 토론글 15개 x (본문 + 댓글 15개)
+    assert list(rows[0]) == collectors.DISCUSSION_COLUMNS
+    assert [r['구분'] for r in rows[:3]] == ['게시글', '댓글', '댓글']
+    assert rows[1]['제목'] == f"(Re) {rows[0]['제목']}"
+
+
+def test_discussion_topic_failure_is_skipped(router):
+    topics_seen = []
+    collectors.crawl_discussions(DISCUSSION_URL, 1, fast_limiter(), on_rows=lambda rows: topics_seen.append(rows[0]['링크']))
+    router.failing.add(topics_seen[0].rstrip('/').rsplit('/', 1)[-1])
+
+    rows, failed = collectors.crawl_discussions(DISCUSSION_URL, 1, fast_limiter())
+    assert failed == 1
+    assert len(rows) == 14 * 16
+    assert router.failed_requests == MAX_RETRIES + 1
+
+
+# --- 디시인사이드 ---
+def test_dc_gallery_with_posts(router):
+    rows, failed, list_error = collectors.crawl_dc_gallery('indiegame', True, '', 2, dc_limiter(), fetch_posts=True)
+    assert (failed, list_error) == (0, None)
+    assert len(rows) == 100
+    assert rows[0]['글번호'] == '250000' and rows[0]['댓글수'] == 19 and rows[0]['본문']
+
+
+def test_dc_post_failure_is_counted(router):
+    router.failing.add('/view/')
+    rows, failed, list_error = collectors.crawl_dc_gallery('indiegame', True, '', 1, dc_limiter(), fetch_posts=True)
+    assert list_error is None and failed == 50
+    assert len(rows) == 50 and '본문' not in rows[0]
+
+
+def test_dc_list_failure_reports_error(router):
+    router.failing.add('/lists/')
+    rows, failed, list_error = collectors.crawl_dc_gallery('indiegame', True, '', 3, dc_limiter())
+    assert rows == [] and list_error
+
+
+# --- 4chan ---
+TARGETS = {'Elden Ring': ['Elden Ring', 'Nightreign']}
+
+
+def test_4chan_collects_found_threads(router):
+    rows, n_indexed, n_threads, failed = collectors.collect_4chan(TARGETS, ['v'], 3)
+    assert (n_indexed, n_threads, failed) == (150, 3, 0)
+    assert len(rows) == 3 * 60
+    assert rows[0]['검색어'] == 'Elden Ring' and rows[0]['구분'] == '원글'
+    assert '<br>' not in rows[0]['내용'] and '\n' in rows[0]['내용']
+
+
+def test_4chan_thread_failure_is_skipped(router):
+    found = collectors.get_catalog_index(['v']).lookup(TARGETS, 3)['Elden Ring']
+    board, no = found[1]
+    router.failing.add(f"/{board}/thread/{no}.json")
+
+    rows, _, n_threads, failed = collectors.collect_4chan(TARGETS, ['v'], 3)
+    assert (n_threads, failed) == (3, 1)
+    assert len(rows) == 2 * 60
+    assert no not in {row['스레드'] for row in rows}
+    assert router.failed_requests == MAX_RETRIES + 1
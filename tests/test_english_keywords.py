@@ -0,0 +1,69 @@
+"""
+영어 키워드 경로(english_keyword_frequencies)가 예전 Kiwi SL 토큰 집계와 같은 결과를 내는지 확인합니다.
+기준은 예전 app.py의 방식 그대로: kiwi.tokenize 결과 중 tag == 'SL', 3글자 이상, 소문자화 후 불용어 제외
+"""
+import json
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import analysis  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+EDGE_CASES = [
+    "straße STRASSE ẞtraße",
+    "#hashtag #Elden word#tag C# ##double #tag-three",
+    "a.b node.js abc.def.ghi ABC.DEF co.uk's",
+    "don't it's well-known co-op über-cool!! foo_bar snake_case CamelCase",
+    "mp3 x64 rtx4090 4k abc.d1",
+    "café naïve résumé ÀÉÎ Việt ÿes øre Œuvre æther",
+    "https://example.com/path?q=word www.test.org see:https://x.com",
+    "mail@host.com user@x first.last@mail.co.kr user@host.co/path @mention @mention.com @user_name!",
+    "(abc) [def] {ghi} abc/def ...abc",
+    "ΑΒΓ привет 한글 English",
+]
+
+
+def kiwi_sl_frequencies(texts):
+    count = Counter()
+    for tokens in analysis.get_kiwi().tokenize(list(texts)):
+        for t in tokens:
+            if t.tag == 'SL' and len(t.form) > 2 and t.form.lower() not in analysis.STOP_WORDS_EN:
+                count[t.form.lower()] += 1
+    return dict(count)
+
+
+def youtube_comment_texts():
+    with open(os.path.join(FIXTURE_DIR, "youtube_commentThreads.json"), encoding='utf-8') as f:
+        items = json.load(f)['items']
+    texts = []
+    for item in items:
+        texts.append(item['snippet']['topLevelComment']['snippet']['textDisplay'])
+        texts.extend(reply['snippet']['textDisplay'] for reply in item.get('replies', {}).get('comments', []))
+    return texts
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases_match_kiwi(text):
+    assert analysis.english_keyword_frequencies([text]).to_dict() == kiwi_sl_frequencies([text])
+
+
+def test_fixture_corpus_matches_kiwi():
+    texts = youtube_comment_texts() + EDGE_CASES
+    assert analysis.english_keyword_frequencies(texts).to_dict() == kiwi_sl_frequencies(texts)
+
+
+def test_sentence_final_period_is_dropped():
+    # Kiwi는 문장 끝 단어를 'gr' + 'eat.'처럼 쪼개지만, 새 경로는 마침표를 떼고 셉니다. (의도한 차이)
+    freq = analysis.english_keyword_frequencies(["The boss is great. Music needs work."])
+    assert freq.to_dict() == {'boss': 1, 'great': 1, 'music': 1, 'needs': 1, 'work': 1}
+
+
+def test_document_keywords_use_the_same_rules():
+    docs = analysis.document_keywords(["straße #tag node.js", "mail@host.com combat combat"], analysis.LANG_EN)
+    assert docs == [Counter({'straße': 1, 'node.js': 1}), Counter({'combat': 2})]
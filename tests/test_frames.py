@@ -0,0 +1,86 @@
+"""
+frames.py 테스트: compact_frame의 dtype 변환과 내보내기 바이트(CSV utf-8-sig / gzip / Parquet)
+"""
+import gzip
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import frames  # noqa: E402
+
+
+def sample_frame(n=6):
+    return pd.DataFrame({
+        '작성일': ['2024-01-0%d' % (i % 3 + 1) for i in range(n)],
+        '내용': ['같은 내용'] * n,
+        '추천수': list(range(n)),
+        '좋아요': [1, None] * (n // 2),
+        '언어': ['english', 'koreana'] * (n // 2),
+        '리뷰ID': [f"id{i}" for i in range(n)],
+    })
+
+
+def test_compact_frame_dtypes():
+    compact = frames.compact_frame(sample_frame())
+    assert pd.api.types.is_datetime64_any_dtype(compact['작성일'])
+    assert compact['작성일'].iloc[0] == pd.Timestamp('2024-01-01')
+    assert compact['추천수'].dtype == np.int8
+    assert compact['좋아요'].dtype == np.float32 and compact['좋아요'].isna().sum() == 3
+    assert isinstance(compact['언어'].dtype, pd.CategoricalDtype)
+    assert not isinstance(compact['내용'].dtype, pd.CategoricalDtype)  # 자유 텍스트는 반복돼도 그대로
+    assert not isinstance(compact['리뷰ID'].dtype, pd.CategoricalDtype)  # 값이 거의 다르면 그대로
+    assert frames.frame_memory(compact) < frames.frame_memory(sample_frame())
+
+
+def test_compact_frame_keeps_datetime_columns():
+    ts = np.array([1700000000, 1700090000], dtype=np.int64)
+    dates = ts.astype('datetime64[s]').astype('datetime64[D]').astype('datetime64[s]')
+    compact = frames.compact_frame(pd.DataFrame({'작성일': dates}))
+    assert compact['작성일'].dtype == 'datetime64[s]'
+    assert compact['작성일'].tolist() == [pd.Timestamp('2023-11-14'), pd.Timestamp('2023-11-15')]
+
+
+def test_compact_frame_bad_values_become_missing():
+    compact = frames.compact_frame(pd.DataFrame({'작성일': ['2024-01-01', '모름'], '조회수': ['10', 'n/a']}))
+    assert compact['작성일'].isna().tolist() == [False, True]
+    assert compact['조회수'].isna().tolist() == [False, True]
+
+
+def test_csv_is_utf8_sig_with_one_header(monkeypatch):
+    monkeypatch.setattr(frames, 'EXPORT_CHUNK_ROWS', 4)  # 여러 조각으로 나눠 써도 헤더는 한 번
+    df = pd.DataFrame({'내용': [f"한글 {i}, 쉼표" for i in range(10)], '추천수': range(10)})
+    data = frames.export_bytes("CSV", df)
+    assert data.startswith(b'\xef\xbb\xbf') and data.count(b'\xef\xbb\xbf') == 1
+    text = data.decode('utf-8-sig')
+    assert text.count('내용,추천수') == 1
+    pd.testing.assert_frame_equal(pd.read_csv(io.StringIO(text)), df, check_dtype=False)
+
+
+def test_empty_frame_exports_header_only():
+    data = frames.export_bytes("CSV", pd.DataFrame(columns=['내용', '추천수']))
+    assert data.decode('utf-8-sig').strip() == '내용,추천수'
+
+
+@pytest.mark.parametrize('fmt', ["CSV (gzip)", "Parquet"])
+def test_binary_formats_round_trip(fmt):
+    df = frames.compact_frame(sample_frame())
+    data = frames.export_bytes(fmt, df)
+    if fmt == "Parquet":
+        back = pd.read_parquet(io.BytesIO(data))
+        assert back['작성일'].tolist() == df['작성일'].tolist()
+        assert back['언어'].astype(str).tolist() == df['언어'].astype(str).tolist()
+    else:
+        assert gzip.decompress(data) == frames.export_bytes("CSV", df)
+
+
+def test_frame_fingerprint():
+    df = sample_frame()
+    assert frames.frame_fingerprint(df) == frames.frame_fingerprint(df.copy())
+    assert frames.frame_fingerprint(df) != frames.frame_fingerprint(df.rename(columns={'내용': '본문'}))
+    assert frames.frame_fingerprint(df) != frames.frame_fingerprint(df.iloc[::-1])
@@ -0,0 +1,137 @@
+"""
+JobManager 테스트: 제출/합류, 결과 가져가기(take), 손 떼기(release), 취소(cancel), 대기열 한도
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from jobs import JobManager, JobQueueFull, RUNNING, DONE, FAILED, CANCELLED  # noqa: E402
+
+TIMEOUT = 5
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(workers=2, queue_limit=2)
+    yield manager
+    manager.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def finished(job):
+    job.future.result(timeout=TIMEOUT)
+    return job
+
+
+def started(job):
+    """워커가 작업을 집어 들고 첫 행을 쌓을 때까지 기다립니다."""
+    deadline = time.monotonic() + TIMEOUT
+    while not (job.state == RUNNING and job.message == "대기"):
+        assert time.monotonic() < deadline, job.state
+        time.sleep(0.005)
+    return job
+
+
+def blocking(gate, rows=()):
+    """gate가 열릴 때까지 rows를 쌓으며 기다리는 작업 함수 (취소되면 CollectionCancelled로 빠져나옴)"""
+    def func(job):
+        job.add_rows(rows)
+        while not gate.wait(0.01):
+            job.update(message="대기")
+        job.update(done=1)
+        return "끝"
+    return func
+
+
+def test_result_is_taken_and_cleared(manager):
+    job, joined = manager.submit('k', "작업", lambda job: job.add_rows([1, 2]) or ['결과'])
+    assert not joined
+    finished(job)
+    assert job.state == DONE
+    assert manager.take(job.id) == ['결과']
+    assert (job.rows, job.result, job.subscribers) == ([], None, 0)
+
+
+def test_rows_are_returned_when_there_is_no_result(manager):
+    job, _ = manager.submit('k', "작업", lambda job: job.add_rows([1, 2]))
+    finished(job)
+    assert manager.take(job.id) == [1, 2]
+
+
+def test_same_key_joins_the_running_job(manager):
+    gate = threading.Event()
+    job, _ = manager.submit('k', "작업", blocking(gate))
+    again, joined = manager.submit('k', "작업", blocking(gate))
+    assert joined and again is job and job.subscribers == 2
+
+    gate.set()
+    finished(job)
+    manager.take(job.id)
+    assert job.result == "끝"  # 아직 보는 세션이 있으면 비우지 않음
+    manager.take(job.id)
+    assert job.result is None
+
+    # 끝난 작업의 키는 풀려서 새 작업이 됩니다.
+    fresh, joined = manager.submit('k', "작업", lambda job: None)
+    assert not joined and fresh is not job
+
+
+def test_last_release_cancels_and_clears(manager):
+    gate = threading.Event()
+    job, _ = manager.submit('k', "작업", blocking(gate, rows=[1]))
+    manager.submit('k', "작업", blocking(gate))
+    manager.release(job.id)
+    assert not job.cancel_event.is_set()  # 한 세션이 아직 보고 있음
+
+    manager.release(job.id)
+    finished(job)
+    assert job.state == CANCELLED and job.rows == []
+
+
+def test_cancel_keeps_partial_rows_for_the_session(manager):
+    gate = threading.Event()
+    job, _ = manager.submit('k', "작업", blocking(gate, rows=[1, 2, 3]))
+    started(job)
+    manager.cancel(job.id)
+    finished(job)
+    assert job.state == CANCELLED and job.subscribers == 1
+    assert manager.take(job.id) == [1, 2, 3]
+    assert job.rows == []
+
+
+def test_cancelled_key_does_not_join(manager):
+    gate = threading.Event()
+    job, _ = manager.submit('k', "작업", blocking(gate))
+    manager.cancel(job.id)
+    other, joined = manager.submit('k', "작업", lambda job: None)
+    assert not joined and other is not job
+    finished(job)
+
+
+def test_failure_is_recorded(manager):
+    def boom(job):
+        job.add_rows(['부분'])
+        raise ValueError("실패")
+    job, _ = manager.submit('k', "작업", boom)
+    finished(job)
+    assert job.state == FAILED and job.error == "ValueError: 실패"
+    assert manager.take(job.id) == ['부분']
+
+
+def test_queue_limit(manager):
+    gate = threading.Event()
+    running = [started(manager.submit(f"run{i}", "작업", blocking(gate))[0]) for i in range(2)]
+    queued = [manager.submit(f"queued{i}", "작업", blocking(gate))[0] for i in range(2)]
+    with pytest.raises(JobQueueFull):
+        manager.submit('one-more', "작업", blocking(gate))
+
+    # 대기 중인 작업은 워커에 닿기 전에 취소됩니다.
+    manager.release(queued[0].id)
+    assert queued[0].state == CANCELLED
+    gate.set()
+    for job in running + queued[1:]:
+        assert finished(job).state == DONE
@@ -0,0 +1,57 @@
+"""
+lxml 파서(parsers.py) 테스트: benchmarks/fixtures/의 녹화 페이지를 그대로 파싱합니다.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import parsers  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_discussion_topics():
+    topics = parsers.parse_discussion_topics(fixture("steam_discussion_list.html"))
+    assert len(topics) == 15
+    link, title = topics[0]
+    assert link == "https://steamcommunity.com/app/1562700/discussions/0/4000444529763028279/"
+    assert title == 'graphics awful 최적화 & "0"'  # 엔티티 복원, 앞뒤 공백 제거
+    assert all(link.startswith("https://steamcommunity.com/app/1562700/discussions/0/") for link, _ in topics)
+
+
+def test_discussion_thread():
+    op, comments = parsers.parse_discussion_thread(fixture("steam_discussion_topic.html"))
+    author, content = op
+    assert author == "글쓴이 & 친구"
+    assert content.startswith("frame 재밌다 스토리")
+    assert len(comments) == 15
+    assert comments[0][0] == "유저0 <KR>"
+    assert all(text for _, text in comments)
+
+
+def test_dc_list_skips_notices():
+    text = fixture("dcinside_list.html")
+    posts = parsers.parse_dc_list(text)
+    assert text.count("ub-notice") == 3 and len(posts) == 50
+    assert posts[0] == {'no': '250000', 'title': '전투 music 전투 difficulty drop 난이도'}
+    assert [int(p['no']) for p in posts] == list(range(250000, 249950, -1))
+
+
+def test_dc_post():
+    post = parsers.parse_dc_post(fixture("dcinside_post.html"))
+    assert post['comments'] == 19
+    assert post['body'].startswith("패치 패치 great drop")
+
+
+def test_empty_pages():
+    assert parsers.parse_discussion_topics("") == []
+    assert parsers.parse_discussion_thread("  ") == (None, [])
+    assert parsers.parse_dc_list("") == []
+    assert parsers.parse_dc_post("") == {'body': "", 'comments': None}
+    assert parsers.parse_dc_post("<html><body><p>삭제된 글</p></body></html>") == {'body': "", 'comments': None}
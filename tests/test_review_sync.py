@@ -0,0 +1,126 @@
+"""
+스팀 리뷰 증분 수집(워터마크/저장 구간/되채우기 커서) 테스트
+benchmarks/replay.py의 재생기로 네트워크 없이 sync_reviews를 돌립니다.
+재생기는 언어마다 페이지당 100개, 리뷰 사이 10분 간격으로 review_pages 페이지를 돌려주고, 그 뒤는 빈 페이지입니다.
+"""
+import json
+import os
+import sys
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import collectors  # noqa: E402
+from replay import ReplayRouter, ReplayAdapter  # noqa: E402
+
+APP_ID = 'test'
+LANGUAGE = 'english'
+EPOCH_START = datetime(2000, 1, 1).date()
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    monkeypatch.setattr(collectors, 'REVIEW_DB_PATH', str(tmp_path / "reviews.db"))
+    collectors._init_review_db.cache_clear()
+    router = ReplayRouter(review_pages=5, review_languages=[LANGUAGE])
+    session = requests.Session()
+    session.mount('https://', ReplayAdapter(router))
+    monkeypatch.setattr(collectors.http_client, 'session', session)  # 공용 세션은 건드리지 않음
+    yield router
+    collectors._init_review_db.cache_clear()
+
+
+def requests_made(router, func):
+    before = router.stats().get('requests', 0)
+    result = func()
+    return result, router.stats().get('requests', 0) - before
+
+
+def stored_count():
+    with closing(collectors.open_review_db()) as conn:
+        return conn.execute("SELECT COUNT(*) FROM reviews WHERE app_id = ?", (APP_ID,)).fetchone()[0]
+
+
+def sync_state():
+    with closing(collectors.open_review_db()) as conn:
+        return conn.execute(
+            "SELECT newest_ts, oldest_ts, exhausted, backfill_cursor FROM sync_state WHERE app_id = ? AND language = ?",
+            (APP_ID, LANGUAGE)
+        ).fetchone()
+
+
+def page_timestamps(router, page):
+    return [r['timestamp_created'] for r in json.loads(router.review_bodies[(LANGUAGE, page)])['reviews']]
+
+
+def pages_until(router, start_date):
+    """start_date 이전 리뷰가 처음 나오는 페이지까지의 페이지 수 (수집이 멈추는 곳)"""
+    start_ts = collectors._day_start_ts(start_date)
+    return next(page + 1 for page in range(router.review_pages) if min(page_timestamps(router, page)) < start_ts)
+
+
+def review_day(router, page):
+    return datetime.fromtimestamp(page_timestamps(router, page)[0], timezone.utc).date()
+
+
+def test_first_sync_walks_to_the_end_and_marks_exhausted(router):
+    fetched, requests = requests_made(router, lambda: collectors.sync_reviews(APP_ID, LANGUAGE, EPOCH_START))
+    assert fetched == stored_count() == 500
+    assert requests == 6  # 5페이지 + 빈 페이지
+    newest_ts, oldest_ts, exhausted, cursor = sync_state()
+    assert exhausted == 1 and cursor is None
+
+
+def test_covered_range_stops_at_the_watermark(router):
+    collectors.sync_reviews(APP_ID, LANGUAGE, EPOCH_START)
+    fetched, requests = requests_made(router, lambda: collectors.sync_reviews(APP_ID, LANGUAGE, EPOCH_START))
+    assert requests == 1  # 첫 페이지가 워터마크에 닿아서 바로 멈춤
+    assert fetched == 100 and stored_count() == 500
+
+
+def test_page_limit_resumes_backfill_from_the_saved_cursor(router, monkeypatch):
+    monkeypatch.setattr(collectors, 'REVIEW_MAX_PAGES', 2)
+    counts = []
+    for _ in range(4):
+        collectors.sync_reviews(APP_ID, LANGUAGE, EPOCH_START)
+        counts.append(stored_count())
+    # 매번 최신 페이지(워터마크 확인) 1장 + 멈춘 커서부터 1장씩 더 내려갑니다.
+    assert counts == [200, 300, 400, 500]
+    assert sync_state()[2:] == (0, 'p5')
+
+    collectors.sync_reviews(APP_ID, LANGUAGE, EPOCH_START)
+    assert sync_state()[2:] == (1, None)
+    _, requests = requests_made(router, lambda: collectors.sync_reviews(APP_ID, LANGUAGE, EPOCH_START))
+    assert requests == 1
+
+
+def test_earlier_start_date_backfills_below_the_stored_range(router):
+    start = review_day(router, 1)
+    pages = pages_until(router, start)
+    collectors.sync_reviews(APP_ID, LANGUAGE, start)
+    assert stored_count() == pages * 100  # start_date를 지난 페이지에서 멈춤
+    newest_ts, oldest_ts, exhausted, cursor = sync_state()
+    assert exhausted == 0 and cursor == f"p{pages}"
+
+    # 같은 기간이면 워터마크 확인만
+    _, requests = requests_made(router, lambda: collectors.sync_reviews(APP_ID, LANGUAGE, start))
+    assert requests == 1
+
+    # 더 이른 start_date: 최신 페이지 1장 후 멈춘 커서부터 이어 받음 (이미 받은 페이지는 다시 받지 않음)
+    earlier = review_day(router, 3)
+    more_pages = pages_until(router, earlier) - pages
+    fetched, requests = requests_made(router, lambda: collectors.sync_reviews(APP_ID, LANGUAGE, earlier))
+    assert requests == 1 + more_pages and fetched == 100 * (1 + more_pages)
+    assert stored_count() == (pages + more_pages) * 100
+    assert sync_state()[1] < oldest_ts
+
+
+def test_estimate_review_target():
+    assert collectors.estimate_review_target(100, 600 * 99, 600 * 100) == 201
+    assert collectors.estimate_review_target(100, 600 * 99, 0) == 100
+    assert collectors.estimate_review_target(100, 1, 10 ** 9) == collectors.REVIEW_MAX_PAGES * 100
@@ -0,0 +1,175 @@
+"""
+스팀 리뷰 일별 키워드 색인 (Streamlit 의존성 없음)
+리뷰 저장소(SQLite)에 (앱, 분석 언어, 날짜, 리뷰 언어, 키워드) → 빈도 표를 두고, 수집 직후 새로 들어온 리뷰만 토큰화해 더합니다.
+기간별 상위 키워드나 두 기간 비교(패치 전/후 등)는 다시 토큰화하지 않고 일별 빈도를 SQL로 합쳐서 답합니다.
+날짜는 load_reviews의 '작성일'과 같은 UTC 기준입니다.
+"""
+import threading
+from collections import Counter, defaultdict
+from contextlib import closing
+from datetime import date
+from functools import lru_cache
+
+import pandas as pd
+
+from analysis import LANG_KR, LANG_EN, document_keywords
+from collectors import open_review_db
+from instrumentation import metrics
+
+TREND_MODES = {LANG_KR: 'kr', LANG_EN: 'en'}
+TREND_INDEX_BATCH = 5000
+TREND_MIN_COUNT = 5       # 두 기간 비교에서 합계가 이보다 적은 키워드는 제외 (잡음)
+TREND_PER_REVIEWS = 1000  # 비교는 리뷰 1000개당 빈도로 (기간마다 리뷰 수가 달라서)
+_EPOCH = date(1970, 1, 1)
+
+TREND_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keyword_daily (
+    app_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (app_id, mode, day, language, keyword)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS keyword_daily_reviews (
+    app_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    reviews INTEGER NOT NULL,
+    PRIMARY KEY (app_id, mode, day, language)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS keyword_indexed (
+    app_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    recommendationid TEXT NOT NULL,
+    PRIMARY KEY (app_id, mode, recommendationid)
+) WITHOUT ROWID;
+"""
+UNINDEXED_SQL = """
+SELECT r.recommendationid, COALESCE(r.language, ''), r.timestamp_created, COALESCE(r.review, '') FROM reviews r
+WHERE r.app_id = ? AND NOT EXISTS (
+    SELECT 1 FROM keyword_indexed k WHERE k.app_id = r.app_id AND k.mode = ? AND k.recommendationid = r.recommendationid
+)
+LIMIT ?
+"""
+COUNT_UPSERT = """
+INSERT INTO keyword_daily (app_id, mode, day, language, keyword, count) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (app_id, mode, day, language, keyword) DO UPDATE SET count = count + excluded.count
+"""
+REVIEWS_UPSERT = """
+INSERT INTO keyword_daily_reviews (app_id, mode, day, language, reviews) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (app_id, mode, day, language) DO UPDATE SET reviews = reviews + excluded.reviews
+"""
+
+
+@lru_cache(maxsize=None)
+def _init_trend_tables():
+    with closing(open_review_db()) as conn:
+        conn.executescript(TREND_SCHEMA)
+    return True
+
+
+def open_trend_db():
+    _init_trend_tables()
+    return open_review_db()
+
+
+@lru_cache(maxsize=None)
+def _index_lock(app_id, mode):
+    return threading.Lock()
+
+
+def to_day(day):
+    return (day - _EPOCH).days
+
+
+def count_unindexed(app_id, lang_option):
+    with closing(open_trend_db()) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM reviews r WHERE r.app_id = ? AND NOT EXISTS (SELECT 1 FROM keyword_indexed k "
+            "WHERE k.app_id = r.app_id AND k.mode = ? AND k.recommendationid = r.recommendationid)",
+            (app_id, TREND_MODES[lang_option])
+        ).fetchone()[0]
+
+
+def update_keyword_index(app_id, lang_options=(LANG_KR, LANG_EN), on_progress=None):
+    """
+    저장소에서 아직 색인하지 않은 리뷰만 TREND_INDEX_BATCH개씩 토큰화해 일별 빈도에 더합니다. (배치마다 커밋)
+    리뷰 ID를 keyword_indexed에 먼저 넣어 보고 새로 들어간 리뷰만 세므로, 다른 프로세스가 같은 앱을 동시에 색인해도 두 번 세지 않습니다.
+    (이미 색인한 리뷰의 본문이 나중에 수정돼도 다시 세지는 않습니다)
+    on_progress(분석 언어, 이번에 색인한 리뷰 수, 남은 리뷰 수)는 배치마다 호출됩니다.
+    반환값: 분석 언어별로 이번에 색인한 리뷰 수
+    """
+    indexed = {}
+    for lang_option in lang_options:
+        mode = TREND_MODES[lang_option]
+        done = 0
+        with _index_lock(app_id, mode), closing(open_trend_db()) as conn:
+            remaining = count_unindexed(app_id, lang_option)
+            while remaining:
+                batch = conn.execute(UNINDEXED_SQL, (app_id, mode, TREND_INDEX_BATCH)).fetchall()
+                if not batch:
+                    break
+                with metrics.span(f'trend.tokenize_{mode}'):
+                    docs = document_keywords([row[3] for row in batch], lang_option)
+
+                with metrics.span('trend.index_write'):
+                    counts, reviews = defaultdict(Counter), Counter()
+                    for (rec_id, language, ts, _), keywords in zip(batch, docs):
+                        claimed = conn.execute("INSERT OR IGNORE INTO keyword_indexed VALUES (?, ?, ?)", (app_id, mode, rec_id))
+                        if not claimed.rowcount:
+                            continue
+                        group = (ts // 86400, language)
+                        counts[group].update(keywords)
+                        reviews[group] += 1
+                    conn.executemany(COUNT_UPSERT, (
+                        (app_id, mode, day, language, keyword, n)
+                        for (day, language), keywords in counts.items() for keyword, n in keywords.items()
+                    ))
+                    conn.executemany(REVIEWS_UPSERT, ((app_id, mode, day, language, n) for (day, language), n in reviews.items()))
+                    conn.commit()
+
+                done += len(batch)
+                remaining = max(remaining - len(batch), 0)
+                if on_progress: on_progress(lang_option, done, remaining)
+        indexed[lang_option] = done
+    return indexed
+
+
+def _range_filter(app_id, lang_option, language, start_date, end_date):
+    sql = "WHERE app_id = ? AND mode = ? AND day BETWEEN ? AND ?"
+    params = [app_id, TREND_MODES[lang_option], to_day(start_date), to_day(end_date)]
+    if language != 'all':
+        sql += " AND language = ?"
+        params.append(language)
+    return sql, params
+
+
+def range_keywords(app_id, lang_option, language, start_date, end_date):
+    """
+    기간(양 끝 포함) 키워드 빈도를 일별 색인에서 합칩니다.
+    반환값: (내림차순 빈도 Series, 기간 안의 색인된 리뷰 수)
+    """
+    where, params = _range_filter(app_id, lang_option, language, start_date, end_date)
+    with metrics.span('trend.range_query'), closing(open_trend_db()) as conn:
+        rows = conn.execute(f"SELECT keyword, SUM(count) FROM keyword_daily {where} GROUP BY keyword", params).fetchall()
+        n_reviews = conn.execute(f"SELECT COALESCE(SUM(reviews), 0) FROM keyword_daily_reviews {where}", params).fetchone()[0]
+    freq = pd.Series(dict(rows), dtype='int64').sort_values(ascending=False, kind='stable')
+    return freq, n_reviews
+
+
+def compare_ranges(app_id, lang_option, language, range_a, range_b, min_count=TREND_MIN_COUNT):
+    """
+    두 기간의 키워드를 리뷰 TREND_PER_REVIEWS개당 빈도로 비교합니다.
+    반환값: (키워드별 DataFrame[이전, 이후, 이전(1000개당), 이후(1000개당), 변화] - 변화 내림차순, 이전 리뷰 수, 이후 리뷰 수)
+    """
+    freq_a, n_a = range_keywords(app_id, lang_option, language, *range_a)
+    freq_b, n_b = range_keywords(app_id, lang_option, language, *range_b)
+    table = pd.DataFrame({'이전': freq_a, '이후': freq_b}).fillna(0).astype('int64')
+    table = table[table['이전'] + table['이후'] >= min_count]
+    table['이전(1000개당)'] = table['이전'] / max(n_a, 1) * TREND_PER_REVIEWS
+    table['이후(1000개당)'] = table['이후'] / max(n_b, 1) * TREND_PER_REVIEWS
+    table['변화'] = table['이후(1000개당)'] - table['이전(1000개당)']
+    return table.sort_values('변화', ascending=False, kind='stable'), n_a, n_b